@@ -1,14 +1,14 @@
 import datetime
 import os
 import django
-from django.db.models import Q, Avg, F, When, Value, DecimalField
-from sqlparse.sql import Case
+from django.db.models import Prefetch
 
 # Set up Django
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
 django.setup()
 
 from main_app.models import *
+from main_app.query_budget import query_budget
 
 
 def populate_db():
@@ -64,27 +64,22 @@ def populate_db():
     book2.co_authors.add(author2, author1)
 
 
+@query_budget(1)
 def get_publishers(search_string=None):
     if not search_string:
         return "No search criteria."
 
-    publishers = Publisher.objects.filter(
-        Q(name__icontains=search_string) | Q(country__icontains=search_string)
-    ).order_by('-rating', 'name')
+    return '\n'.join(stream_publishers(search_string)) or "No publishers found."
 
-    if not publishers.exists():
-        return "No publishers found."
 
-    return '\n'.join(
-        f"Publisher: {p.name}, country: {p.country}, rating: {p.rating}"
-        for p in publishers
-    )
+def stream_publishers(search_string, chunk_size=2000):
+    for p in Publisher.objects.search(search_string).iterator(chunk_size=chunk_size):
+        yield f"Publisher: {p.name}, country: {p.country}, rating: {p.rating}"
 
 
+@query_budget(1)
 def get_top_publisher():
-    top_publisher = Publisher.objects.annotate(
-        total_books=Count('books')
-    ).order_by('-total_books', 'name').first()
+    top_publisher = Publisher.objects.get_publishers_by_books_count().first()
 
     if not top_publisher:
         return "No publishers found."
@@ -92,55 +87,44 @@ def get_top_publisher():
     return f"Top Publisher: {top_publisher.name} with {top_publisher.total_books} books."
 
 
+@query_budget(1)
 def get_top_main_author():
-    top_main_author = Author.objects.annotate(
-        total_books=Count('main_author')
-    ).order_by('-total_books', 'name').first()
+    report = Author.objects.get_top_main_author_report()
 
-    if top_main_author is None or top_main_author.total_books == 0:
+    if report is None:
         return "No results."
 
-    average_rating = Book.objects.filter(main_author=top_main_author).aggregate(
-        avg_rating=Avg('rating')
-    )['avg_rating']
-
-    author_books = [b.title for b in Book.objects.filter(main_author=top_main_author)]
+    author_name, author_books, average_rating = report
     books_string = ', '.join(author_books)
 
     return (
-        f"Top Author: {top_main_author.name}, own book titles: {books_string},"
+        f"Top Author: {author_name}, own book titles: {books_string},"
         f" books average rating: {average_rating}"
     )
 
 
+@query_budget(1)
 def get_authors_by_books_count():
-    authors = Author.objects.annotate(
-        main_count=Count('main_author'),
-        co_count=Count('co_authors', distinct=True)
-    ).filter(main_count__gt=0).annotate(
-        total_books=F('main_count') + F('co_count')
-    ).filter(total_books__gt=0).order_by('-total_books', 'name')[:3]
-
-    if not authors:
-        return "No results."
+    return '\n'.join(stream_authors_by_books_count(limit=3)) or "No results."
 
-    return '\n'.join(
-        f"{author.name} authored {author.total_books} books."
-        for author in authors
-    )
 
+def stream_authors_by_books_count(limit=None, chunk_size=2000):
+    authors = Author.objects.get_authors_by_books_count()[:limit]
+
+    for author in authors.iterator(chunk_size=chunk_size):
+        yield f"{author.name} authored {author.total_books} books."
 
+
+@query_budget(2)
 def get_bestseller():
-    top_book = Book.objects.annotate(
-        total_authors=Count('co_authors', distinct=True),
-        composed_index=F('total_authors') + F('rating') + 1
-    ).order_by('-composed_index', '-rating', '-total_authors', 'title').first()
+    top_book = Book.objects.by_composed_index().select_related('main_author').prefetch_related(
+        Prefetch('co_authors', queryset=Author.objects.order_by('name'))
+    ).first()
 
     if not top_book:
         return "No results."
 
-    co_authors = top_book.co_authors.all().order_by('name')
-    co_authors_string = '/'.join(a.name for a in co_authors) if co_authors else 'N/A'
+    co_authors_string = '/'.join(a.name for a in top_book.co_authors.all()) or 'N/A'
 
     return (
         f"Top bestseller: {top_book.title}, index: {top_book.composed_index:.1f}."
@@ -149,23 +133,26 @@ def get_bestseller():
     )
 
 
-def increase_price():
-    books_to_update = Book.objects.filter(
-        publication_date__year=2025
-    ).annotate(
-        total_rating=F('rating') + F('publisher__rating')
-    ).filter(total_rating__gte=8.0)
+def stream_bestsellers(chunk_size=2000):
+    books = Book.objects.by_composed_index().select_related('main_author').prefetch_related(
+        Prefetch('co_authors', queryset=Author.objects.order_by('name'))
+    )
+
+    for book in books.iterator(chunk_size=chunk_size):
+        co_authors_string = '/'.join(a.name for a in book.co_authors.all()) or 'N/A'
+        yield (
+            f"Bestseller: {book.title}, index: {book.composed_index:.1f}."
+            f" Main author: {book.main_author.name}."
+            f" Co-authors: {co_authors_string}."
+        )
+
 
-    if not books_to_update.exists():
+@query_budget(2)
+def increase_price():
+    if not Book.objects.for_price_increase().exists():
         return "No changes in price."
 
-    updated_books = books_to_update.update(
-        price=Case(
-            When(price__gt=50.0, then=F('price') * 1.1),
-            default=F('price') * 1.2,
-            output_field=DecimalField(max_digits=10, decimal_places=2)
-        )
-    )
+    updated_books = Book.objects.increase_price()
 
     return (
         f"Prices increased for {updated_books} book/s."
@@ -0,0 +1,100 @@
+from functools import lru_cache
+
+from django.core.exceptions import ValidationError
+from django.core.validators import BaseValidator
+
+
+@lru_cache(maxsize=None)
+def field_validators(model):
+    return [(field, field.validators) for field in model._meta.concrete_fields]
+
+
+def field_errors(field, values, checked):
+    # Field.validate() per column: choices, null and blank.
+    choices = {choice for choice, _ in field.flatchoices} if field.choices else None
+
+    for index in checked:
+        value = values[index]
+        if choices is not None and value not in field.empty_values and value not in choices:
+            yield index, ValidationError(
+                field.error_messages['invalid_choice'], code='invalid_choice', params={'value': value}
+            )
+        elif value is None and not field.null:
+            yield index, ValidationError(field.error_messages['null'], code='null')
+        elif not field.blank and value in field.empty_values:
+            yield index, ValidationError(field.error_messages['blank'], code='blank')
+
+
+def column_errors(validator, values):
+    if isinstance(validator, BaseValidator):
+        # Min/Max value and length validators: one comparison per cell, no exception per row.
+        limit = validator.limit_value() if callable(validator.limit_value) else validator.limit_value
+        for index, value in enumerate(values):
+            if value is not None:
+                cleaned = validator.clean(value)
+                if validator.compare(cleaned, limit):
+                    params = {'limit_value': limit, 'show_value': cleaned, 'value': value}
+                    yield index, ValidationError(validator.message, code=validator.code, params=params)
+        return
+
+    for index, value in enumerate(values):
+        if value is not None:
+            try:
+                validator(value)
+            except ValidationError as error:
+                yield index, error
+
+
+def column_values(field, objs, report):
+    values = []
+    checked = []
+
+    for index, obj in enumerate(objs):
+        raw_value = getattr(obj, field.attname)
+
+        # Like Model.clean_fields(): an empty value in a blank-allowed field is not validated.
+        if field.blank and raw_value in field.empty_values:
+            values.append(None)
+            continue
+
+        try:
+            values.append(field.to_python(raw_value))
+        except ValidationError as error:
+            report.setdefault(index, {}).setdefault(field.name, []).extend(error.messages)
+            values.append(None)
+            continue
+
+        checked.append(index)
+
+    return values, checked
+
+
+def validate_batch(objs):
+    objs = list(objs)
+    if not objs:
+        return {}
+
+    report = {}
+
+    for field, validators in field_validators(type(objs[0])):
+        values, checked = column_values(field, objs, report)
+        for index, error in field_errors(field, values, checked):
+            report.setdefault(index, {}).setdefault(field.name, []).extend(error.messages)
+            # Field.clean() stops at the first failing step, so validators never see this value.
+            values[index] = None
+
+        for validator in validators:
+            for index, error in column_errors(validator, values):
+                report.setdefault(index, {}).setdefault(field.name, []).extend(error.messages)
+
+    return dict(sorted(report.items()))
+
+
+def clean_batch(objs):
+    report = validate_batch(objs)
+
+    if report:
+        raise ValidationError({
+            f"row {index}": [f"{field}: {message}" for field, messages in errors.items() for message in messages]
+            for index, errors in report.items()
+        })
@@ -0,0 +1,87 @@
+from collections import Counter, defaultdict
+from itertools import islice
+
+from django.db import transaction
+
+from main_app.batch_validation import clean_batch
+from main_app.models import Publisher, Author, Book
+from main_app.signals import shift_counter
+
+
+BOOK_FIELDS = ('title', 'publication_date', 'summary', 'genre', 'price', 'rating', 'is_bestseller')
+
+
+class NaturalKeyCache:
+    def __init__(self, model):
+        self.model = model
+        self.ids = {}
+
+    def resolve(self, names):
+        missing = set(names) - self.ids.keys()
+
+        if missing:
+            # Names are not unique, so the oldest row with a given name wins.
+            for pk, name in self.model.objects.filter(name__in=missing).order_by('id').values_list('id', 'name'):
+                self.ids.setdefault(name, pk)
+
+        unknown = missing - self.ids.keys()
+        if unknown:
+            raise self.model.DoesNotExist(
+                f"No {self.model.__name__.lower()} named: {', '.join(sorted(unknown))}"
+            )
+
+    def __getitem__(self, name):
+        return self.ids[name]
+
+
+def add_counts(model, field, counts):
+    # One UPDATE per distinct delta, and a batch has only a few.
+    pks_by_delta = defaultdict(list)
+    for pk, delta in counts.items():
+        pks_by_delta[delta].append(pk)
+
+    for delta, pks in pks_by_delta.items():
+        shift_counter(model, pks, field, delta)
+
+
+def bulk_load_books(rows, batch_size=2000):
+    publishers = NaturalKeyCache(Publisher)
+    authors = NaturalKeyCache(Author)
+    rows = iter(rows)
+    created = 0
+
+    while batch := list(islice(rows, batch_size)):
+        publishers.resolve(row['publisher'] for row in batch)
+        authors.resolve(
+            name
+            for row in batch
+            for name in (row['main_author'], *row.get('co_authors', ()))
+        )
+
+        books = [
+            Book(
+                publisher_id=publishers[row['publisher']],
+                main_author_id=authors[row['main_author']],
+                **{field: row[field] for field in BOOK_FIELDS if field in row},
+            )
+            for row in batch
+        ]
+        clean_batch(books)
+
+        with transaction.atomic():
+            books = Book.objects.bulk_create(books)
+
+            links = Book.co_authors.through.objects.bulk_create(
+                Book.co_authors.through(book_id=book.id, author_id=author_id)
+                for book, row in zip(books, batch)
+                for author_id in {authors[name] for name in row.get('co_authors', ())}
+            )
+
+            # bulk_create sends no signals, so the counters move by what this batch inserted.
+            add_counts(Publisher, 'books_count', Counter(book.publisher_id for book in books))
+            add_counts(Author, 'main_books_count', Counter(book.main_author_id for book in books))
+            add_counts(Author, 'co_authored_count', Counter(link.author_id for link in links))
+
+        created += len(books)
+
+    return created
@@ -0,0 +1,149 @@
+import csv
+import time
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from main_app.models import Publisher, Author, Book
+
+
+CO_AUTHORS = Book.co_authors.through
+
+# Loaded in this order so foreign keys always point at rows that are already in place.
+CATALOG_TABLES = {
+    'publishers': (Publisher, ('id', 'name', 'established_date', 'country', 'rating')),
+    'authors': (Author, ('id', 'name', 'birth_date', 'country', 'is_active')),
+    'books': (Book, (
+        'id', 'title', 'publication_date', 'summary', 'genre', 'price', 'rating',
+        'is_bestseller', 'publisher_id', 'main_author_id',
+    )),
+    'co_authors': (CO_AUTHORS, ('book_id', 'author_id')),
+}
+
+# Columns the feeds do not carry, filled in on insert.
+INSERT_DEFAULTS = {
+    Publisher: {'books_count': '0'},
+    Author: {'updated_at': 'now()', 'main_books_count': '0', 'co_authored_count': '0'},
+    Book: {'updated_at': 'now()'},
+}
+
+# One JSON document per line, copied verbatim: neither byte occurs in serialized JSON.
+RAW_LINE_OPTIONS = "FORMAT csv, DELIMITER e'\\x02', QUOTE e'\\x01'"
+
+
+def file_format(path):
+    if str(path).endswith('.jsonl'):
+        return 'jsonl'
+    if str(path).endswith('.csv'):
+        return 'csv'
+    raise ValueError(f"Unsupported catalog file: {path}. Use .csv or .jsonl.")
+
+
+def feed_columns(name, present):
+    model, columns = CATALOG_TABLES[name]
+    fields = {field.column: field for field in model._meta.concrete_fields}
+
+    unknown = [column for column in present if column not in columns]
+    if unknown:
+        raise ValueError(f"Unknown {name} column/s: {', '.join(sorted(unknown))}.")
+
+    missing = [column for column in columns if column not in present and not fields[column].null]
+    if missing:
+        raise ValueError(f"Missing required {name} column/s: {', '.join(missing)}.")
+
+    # Keep the catalog order; columns absent from the feed are left untouched by the upsert.
+    return [column for column in columns if column in present]
+
+
+def import_table(cursor, name, path):
+    qn = connection.ops.quote_name
+    model, columns = CATALOG_TABLES[name]
+    table = qn(model._meta.db_table)
+    staging = qn(f"staging_{model._meta.db_table}")
+    raw = qn(f"staging_{model._meta.db_table}_raw")
+    start = time.perf_counter()
+
+    cursor.execute(
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS"
+        f" SELECT {', '.join(map(qn, columns))} FROM {table} WITH NO DATA"
+    )
+
+    with open(path, encoding='utf-8', newline='') as feed:
+        if file_format(path) == 'csv':
+            header = next(csv.reader([feed.readline()]), [])
+            if len(set(header)) != len(header):
+                raise ValueError(f"Duplicate {name} column/s in the CSV header.")
+            columns = feed_columns(name, header)
+            cursor.copy_expert(
+                f"COPY {staging} ({', '.join(map(qn, header))}) FROM STDIN WITH (FORMAT csv)", feed
+            )
+        else:
+            cursor.execute(f"CREATE TEMP TABLE {raw} (doc jsonb) ON COMMIT DROP")
+            cursor.copy_expert(f"COPY {raw} FROM STDIN WITH ({RAW_LINE_OPTIONS})", feed)
+            cursor.execute(f"SELECT DISTINCT jsonb_object_keys(doc) FROM {raw}")
+            columns = feed_columns(name, [row[0] for row in cursor.fetchall()])
+            cursor.execute(
+                f"INSERT INTO {staging} SELECT r.* FROM {raw},"
+                f" jsonb_populate_record(NULL::{staging}, doc) r"
+            )
+
+    defaults = INSERT_DEFAULTS.get(model, {})
+    insert_columns = ', '.join(map(qn, (*columns, *defaults)))
+    select_columns = ', '.join((*map(qn, columns), *defaults.values()))
+
+    if model is CO_AUTHORS:
+        conflict = f"ON CONFLICT ({qn('book_id')}, {qn('author_id')}) DO NOTHING"
+    else:
+        updates = [f"{qn(column)} = EXCLUDED.{qn(column)}" for column in columns if column != 'id']
+        if 'updated_at' in defaults:
+            updates.append(f"{qn('updated_at')} = now()")
+        conflict = f"ON CONFLICT ({qn('id')}) DO UPDATE SET {', '.join(updates)}"
+
+    cursor.execute(f"INSERT INTO {table} ({insert_columns}) SELECT {select_columns} FROM {staging} {conflict}")
+    rows = cursor.rowcount
+
+    return rows, time.perf_counter() - start
+
+
+def import_catalog(paths):
+    # One transaction for the whole catalog; the ON COMMIT DROP staging tables live until it ends.
+    with transaction.atomic(), connection.cursor() as cursor:
+        results = {
+            name: import_table(cursor, name, paths[name])
+            for name in CATALOG_TABLES
+            if paths.get(name)
+        }
+
+        # Rows arrive with explicit ids, so move the sequences past them.
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Publisher, Author, Book, CO_AUTHORS]):
+            cursor.execute(sql)
+
+        # COPY sends no signals, so rebuild the book counters from the imported rows.
+        Publisher.objects.recount_books()
+        Author.objects.recount_books()
+
+    return results
+
+
+def export_table(cursor, name, path):
+    qn = connection.ops.quote_name
+    model, columns = CATALOG_TABLES[name]
+    select = f"SELECT {', '.join(map(qn, columns))} FROM {qn(model._meta.db_table)} ORDER BY {qn(columns[0])}"
+    start = time.perf_counter()
+
+    with open(path, 'w', encoding='utf-8', newline='') as feed:
+        if file_format(path) == 'csv':
+            cursor.copy_expert(f"COPY ({select}) TO STDOUT WITH (FORMAT csv, HEADER true)", feed)
+        else:
+            cursor.copy_expert(f"COPY (SELECT row_to_json(t) FROM ({select}) t) TO STDOUT WITH ({RAW_LINE_OPTIONS})", feed)
+
+    return cursor.rowcount, time.perf_counter() - start
+
+
+def export_catalog(paths):
+    with connection.cursor() as cursor:
+        return {
+            name: export_table(cursor, name, paths[name])
+            for name in CATALOG_TABLES
+            if paths.get(name)
+        }
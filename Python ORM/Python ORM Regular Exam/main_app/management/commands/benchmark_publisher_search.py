@@ -0,0 +1,86 @@
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from main_app.models import Publisher
+
+
+COUNTRIES = ('US', 'UK', 'Bulgaria', 'Germany', 'France', 'Spain', 'Italy', 'Canada', 'Japan', 'Brazil')
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds publishers and compares search latency of the trigram and the LIKE paths. '
+        'Runs in one transaction that is rolled back, so the seeded rows are never kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--publishers', type=int, default=1_000_000)
+        parser.add_argument('--runs', type=int, default=200)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.benchmark(options)
+            transaction.set_rollback(True)
+
+    def benchmark(self, options):
+        rng = random.Random(options['seed'])
+        self.seed_publishers(rng, options['publishers'], options['batch_size'])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Publisher._meta.db_table}")
+
+        terms = [self.random_word(rng, rng.randint(3, 6)) for _ in range(options['runs'])]
+
+        with transaction.atomic():
+            # The LIKE baseline must not be served by the UPPER() trigram indexes; the savepoint restores them.
+            self.drop_trigram_indexes()
+            self.report('like', Publisher.objects.search_by_substring, terms)
+            transaction.set_rollback(True)
+
+        self.report('trigram', Publisher.objects.search, terms)
+
+    def report(self, label, search, terms):
+        timings = []
+        for term in terms:
+            start = time.perf_counter()
+            list(search(term)[:20])
+            timings.append((time.perf_counter() - start) * 1000)
+
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"{label}: p50 {percentiles[49]:.2f} ms, p99 {percentiles[98]:.2f} ms over {len(timings)} searches"
+        )
+
+    @staticmethod
+    def drop_trigram_indexes():
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Publisher._meta.db_table)
+            for name, constraint in constraints.items():
+                if constraint.get('type') == 'gin':
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+
+    def seed_publishers(self, rng, total, batch_size):
+        missing = total - Publisher.objects.count()
+
+        while missing > 0:
+            size = min(batch_size, missing)
+            Publisher.objects.bulk_create(
+                Publisher(
+                    name=self.random_word(rng, rng.randint(5, 20)).capitalize(),
+                    country=rng.choice(COUNTRIES),
+                    rating=round(rng.uniform(0.0, 5.0), 1),
+                )
+                for _ in range(size)
+            )
+            missing -= size
+
+    @staticmethod
+    def random_word(rng, length):
+        return ''.join(rng.choices(string.ascii_lowercase, k=length))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from main_app.catalog_copy import CATALOG_TABLES, export_catalog
+
+
+class Command(BaseCommand):
+    help = 'Streams the publisher, author and book tables to .csv or .jsonl files with COPY.'
+
+    def add_arguments(self, parser):
+        for name in CATALOG_TABLES:
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name, metavar='PATH')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Catalog export uses COPY and needs PostgreSQL.")
+
+        paths = {name: options[name] for name in CATALOG_TABLES}
+        if not any(paths.values()):
+            raise CommandError("Pass at least one of: " + ', '.join(f"--{n.replace('_', '-')}" for n in CATALOG_TABLES))
+
+        for name, (rows, elapsed) in export_catalog(paths).items():
+            rate = rows / elapsed if elapsed else 0
+            self.stdout.write(f"{name}: {rows} rows exported in {elapsed:.2f} s ({rate:.0f} rows/sec)")
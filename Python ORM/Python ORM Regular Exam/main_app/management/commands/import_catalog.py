@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from main_app.catalog_copy import CATALOG_TABLES, import_catalog
+
+
+class Command(BaseCommand):
+    help = 'Streams publisher, author and book feeds (.csv or .jsonl) into the catalog with COPY and upserts them.'
+
+    def add_arguments(self, parser):
+        for name in CATALOG_TABLES:
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name, metavar='PATH')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Catalog import uses COPY and needs PostgreSQL.")
+
+        paths = {name: options[name] for name in CATALOG_TABLES}
+        if not any(paths.values()):
+            raise CommandError("Pass at least one of: " + ', '.join(f"--{n.replace('_', '-')}" for n in CATALOG_TABLES))
+
+        try:
+            results = import_catalog(paths)
+        except ValueError as error:
+            raise CommandError(error)
+
+        for name, (rows, elapsed) in results.items():
+            rate = rows / elapsed if elapsed else 0
+            self.stdout.write(f"{name}: {rows} rows upserted in {elapsed:.2f} s ({rate:.0f} rows/sec)")
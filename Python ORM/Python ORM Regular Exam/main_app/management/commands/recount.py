@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main_app.models import Publisher, Author
+
+
+class Command(BaseCommand):
+    help = 'Recalculates the denormalized book counters on Publisher and Author.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            publishers = Publisher.objects.recount_books()
+            authors = Author.objects.recount_books()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Recounted books for {publishers} publisher/s and {authors} author/s."
+        ))
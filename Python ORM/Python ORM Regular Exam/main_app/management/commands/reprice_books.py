@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from main_app.models import RepricingCheckpoint
+from main_app.repricing import reprice_books_in_chunks
+
+
+class Command(BaseCommand):
+    help = 'Applies the book price increase in primary-key chunks, resuming from the last committed chunk.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--run-name', default='increase_price')
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--restart', action='store_true')
+
+    def handle(self, *args, **options):
+        run_name = options['run_name']
+
+        if options['restart']:
+            RepricingCheckpoint.objects.filter(run_name=run_name).delete()
+
+        start = time.perf_counter()
+        checkpoint = None
+
+        for checkpoint, updated_books, elapsed in reprice_books_in_chunks(run_name, options['chunk_size']):
+            rate = updated_books / elapsed if elapsed else 0
+            self.stdout.write(
+                f"Books up to id {checkpoint.last_book_id}/{checkpoint.max_book_id}:"
+                f" {updated_books} repriced ({rate:.0f} rows/sec)"
+            )
+
+        if checkpoint is None:
+            self.stdout.write(f"Run '{run_name}' has already finished. Use --restart to run it again.")
+            return
+
+        total_elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Prices increased for {checkpoint.books_updated} book/s"
+            f" ({checkpoint.books_updated / total_elapsed:.0f} rows/sec overall)."
+        ))
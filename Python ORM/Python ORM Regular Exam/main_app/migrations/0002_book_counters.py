@@ -0,0 +1,48 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='co_authored_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='main_books_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='publisher',
+            name='books_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['-main_books_count', 'name'], name='author_main_books_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publisher',
+            index=models.Index(fields=['-books_count', 'name'], name='publisher_books_count_idx'),
+        ),
+        migrations.RunSQL(
+            sql=[
+                "UPDATE main_app_publisher SET books_count = ("
+                " SELECT COUNT(*) FROM main_app_book WHERE main_app_book.publisher_id = main_app_publisher.id)",
+                "UPDATE main_app_author SET main_books_count = ("
+                " SELECT COUNT(*) FROM main_app_book WHERE main_app_book.main_author_id = main_app_author.id)",
+                "UPDATE main_app_author SET co_authored_count = ("
+                " SELECT COUNT(*) FROM main_app_book_co_authors"
+                " WHERE main_app_book_co_authors.author_id = main_app_author.id)",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
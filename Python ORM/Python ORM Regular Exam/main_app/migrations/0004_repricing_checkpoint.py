@@ -0,0 +1,25 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_publisher_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RepricingCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_name', models.CharField(max_length=100, unique=True)),
+                ('last_book_id', models.BigIntegerField(default=0)),
+                ('max_book_id', models.BigIntegerField(default=0)),
+                ('books_updated', models.PositiveIntegerField(default=0)),
+                ('is_finished', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_repricing_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='book',
+            name='main_author',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='main_author', to='main_app.author'),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='publisher',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='books', to='main_app.publisher'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['publication_date'], name='book_publication_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['publisher', 'rating'], name='book_publisher_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['main_author', 'rating'], name='book_main_author_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(condition=models.Q(('is_bestseller', True)), fields=['-rating', 'title'], name='book_bestseller_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:35
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_book_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='author',
+            name='author_main_books_count_idx',
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(models.OrderBy(django.db.models.expressions.CombinedExpression(models.F('main_books_count'), '+', models.F('co_authored_count')), descending=True), models.F('name'), condition=models.Q(('main_books_count__gt', 0)), name='author_total_books_idx'),
+        ),
+    ]
@@ -1,16 +1,111 @@
+import datetime
+
 from django.core.validators import MinLengthValidator, MaxLengthValidator, MinValueValidator, MaxValueValidator
-from django.db import models
-from django.db.models import Count
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import models, connection
+from django.db.models import Count, Avg, Subquery, Window, F, OuterRef, Value, Q, Case, When, DecimalField
+from django.db.models.functions import Coalesce, Greatest
+
+
+def count_books_subquery(**lookup):
+    return Coalesce(
+        Subquery(
+            Book.objects.filter(**lookup)
+            .order_by()
+            .values(*lookup)
+            .annotate(total=Count('id'))
+            .values('total')
+        ),
+        Value(0),
+    )
+
+
+def increased_price():
+    return Case(
+        When(price__gt=50.0, then=F('price') * 1.1),
+        default=F('price') * 1.2,
+        output_field=DecimalField(max_digits=10, decimal_places=2)
+    )
+
+
+class PublisherQuerySet(models.QuerySet):
+    def recount_books(self):
+        return self.update(books_count=count_books_subquery(publisher=OuterRef('pk')))
+
+
+class AuthorQuerySet(models.QuerySet):
+    def recount_books(self):
+        return self.update(
+            main_books_count=count_books_subquery(main_author=OuterRef('pk')),
+            co_authored_count=count_books_subquery(co_authors=OuterRef('pk')),
+        )
 
 
-class PublisherManager(models.Manager):
+class PublisherManager(models.Manager.from_queryset(PublisherQuerySet)):
     def get_publishers_by_books_count(self):
         return (
             self.annotate(
-                total_books=Count('books')
-            ).order_by('-total_books', 'name')
+                total_books=F('books_count')
+            ).order_by('-books_count', 'name')
+        )
+
+    def search_by_substring(self, search_string):
+        return self.filter(
+            Q(name__icontains=search_string) | Q(country__icontains=search_string)
+        ).order_by('-rating', 'name')
+
+    def search(self, search_string):
+        if connection.vendor != 'postgresql':
+            return self.search_by_substring(search_string)
+
+        # icontains compiles to UPPER(col) LIKE UPPER(...), which the UPPER() trigram indexes serve.
+        return self.search_by_substring(search_string).annotate(
+            similarity=Greatest(
+                TrigramSimilarity('name', search_string),
+                TrigramSimilarity('country', search_string),
+            )
+        ).order_by('-similarity', '-rating', 'name')
+
+
+class AuthorManager(models.Manager.from_queryset(AuthorQuerySet)):
+    def get_authors_by_books_count(self):
+        return (
+            self.filter(main_books_count__gt=0)
+            .annotate(total_books=F('main_books_count') + F('co_authored_count'))
+            .order_by('-total_books', 'name')
+        )
+
+    def get_top_main_author_report(self):
+        if connection.vendor == 'postgresql':
+            top_author = self.annotate(
+                total_books=Count('main_author'),
+                avg_rating=Avg('main_author__rating'),
+                book_titles=ArrayAgg('main_author__title', ordering='main_author__id'),
+            ).order_by('-total_books', 'name').first()
+
+            if top_author is None or top_author.total_books == 0:
+                return None
+
+            return top_author.name, top_author.book_titles, top_author.avg_rating
+
+        # No ArrayAgg outside PostgreSQL, so read the author's books with a window average instead.
+        top_author_id = self.annotate(
+            total_books=Count('main_author')
+        ).order_by('-total_books', 'name').values('id')[:1]
+
+        books = list(
+            Book.objects.filter(main_author_id=Subquery(top_author_id))
+            .select_related('main_author')
+            .annotate(avg_rating=Window(Avg('rating')))
+            .order_by('id')
         )
 
+        if not books:
+            return None
+
+        return books[0].main_author.name, [b.title for b in books], books[0].avg_rating
+
 
 class Publisher(models.Model):
     name = models.CharField(
@@ -29,8 +124,14 @@ class Publisher(models.Model):
         validators=[MinValueValidator(0.0), MaxValueValidator(5.0)],
         default=0.0
     )
+    books_count = models.PositiveIntegerField(default=0)
     objects = PublisherManager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-books_count', 'name'], name='publisher_books_count_idx'),
+        ]
+
 
 class Author(models.Model):
     name = models.CharField(
@@ -48,6 +149,42 @@ class Author(models.Model):
     )
     is_active = models.BooleanField(default=True)
     updated_at = models.DateTimeField(auto_now=True)
+    main_books_count = models.PositiveIntegerField(default=0)
+    co_authored_count = models.PositiveIntegerField(default=0)
+    objects = AuthorManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                (F('main_books_count') + F('co_authored_count')).desc(),
+                'name',
+                condition=Q(main_books_count__gt=0),
+                name='author_total_books_idx',
+            ),
+        ]
+
+
+class BookQuerySet(models.QuerySet):
+    def for_price_increase(self):
+        return self.filter(
+            publication_date__gte=datetime.date(2025, 1, 1),
+            publication_date__lt=datetime.date(2026, 1, 1),
+        ).annotate(
+            total_rating=F('rating') + F('publisher__rating')
+        ).filter(total_rating__gte=8.0)
+
+    def increase_price(self):
+        return self.for_price_increase().update(price=increased_price())
+
+    def by_composed_index(self):
+        return self.annotate(
+            total_authors=Count('co_authors', distinct=True),
+            composed_index=F('total_authors') + F('rating') + 1
+        ).order_by('-composed_index', '-rating', '-total_authors', 'title')
+
+
+class BookManager(models.Manager.from_queryset(BookQuerySet)):
+    pass
 
 
 class Book(models.Model):
@@ -88,13 +225,41 @@ class Book(models.Model):
         Publisher,
         on_delete=models.CASCADE,
         related_name='books',
+        db_index=False,
     )
     main_author = models.ForeignKey(
         Author,
         on_delete=models.CASCADE,
         related_name='main_author',
+        db_index=False,
     )
     co_authors = models.ManyToManyField(
         Author,
         related_name='co_authors',
     )
+    objects = BookManager()
+
+    class Meta:
+        # The composite indexes lead with the foreign keys, so those need no indexes of their own.
+        indexes = [
+            models.Index(fields=['publication_date'], name='book_publication_date_idx'),
+            models.Index(fields=['publisher', 'rating'], name='book_publisher_rating_idx'),
+            models.Index(fields=['main_author', 'rating'], name='book_main_author_rating_idx'),
+            models.Index(
+                fields=['-rating', 'title'],
+                name='book_bestseller_rating_idx',
+                condition=Q(is_bestseller=True),
+            ),
+        ]
+
+
+class RepricingCheckpoint(models.Model):
+    run_name = models.CharField(
+        max_length=100,
+        unique=True
+    )
+    last_book_id = models.BigIntegerField(default=0)
+    max_book_id = models.BigIntegerField(default=0)
+    books_updated = models.PositiveIntegerField(default=0)
+    is_finished = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
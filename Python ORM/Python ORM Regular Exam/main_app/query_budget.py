@@ -0,0 +1,46 @@
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections, DEFAULT_DB_ALIAS
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class query_budget:
+    def __init__(self, max_queries, using=DEFAULT_DB_ALIAS):
+        self.max_queries = max_queries
+        self.using = using
+        self.queries = []
+
+    def __call__(self, func):
+        @wraps(func)
+        def inner(*args, **kwargs):
+            # Decorated functions are only checked when enabled, so an exceeded budget never fails in production.
+            if not settings.ENFORCE_QUERY_BUDGETS:
+                return func(*args, **kwargs)
+
+            with query_budget(self.max_queries, self.using):
+                return func(*args, **kwargs)
+
+        return inner
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.queries = []
+        self._wrapper = connections[self.using].execute_wrapper(self.count_query)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+
+        if exc_type is None and len(self.queries) > self.max_queries:
+            executed = '\n'.join(f"{i}. {sql}" for i, sql in enumerate(self.queries, start=1))
+            raise QueryBudgetExceeded(
+                f"{len(self.queries)} queries executed, budget is {self.max_queries}:\n{executed}"
+            )
@@ -0,0 +1,35 @@
+import time
+
+from django.db import transaction
+from django.db.models import Max
+
+from main_app.models import Book, RepricingCheckpoint
+
+
+def reprice_books_in_chunks(run_name, chunk_size=5000):
+    checkpoint, _ = RepricingCheckpoint.objects.get_or_create(
+        run_name=run_name,
+        defaults={'max_book_id': Book.objects.aggregate(max_id=Max('id'))['max_id'] or 0},
+    )
+
+    while not checkpoint.is_finished:
+        start = time.perf_counter()
+
+        # The chunk and its checkpoint commit together, so a resumed run never reprices a book twice.
+        with transaction.atomic():
+            checkpoint = RepricingCheckpoint.objects.select_for_update().get(pk=checkpoint.pk)
+            if checkpoint.is_finished:
+                break
+
+            upper_id = min(checkpoint.last_book_id + chunk_size, checkpoint.max_book_id)
+            updated_books = Book.objects.filter(
+                id__gt=checkpoint.last_book_id,
+                id__lte=upper_id,
+            ).increase_price()
+
+            checkpoint.last_book_id = upper_id
+            checkpoint.books_updated += updated_books
+            checkpoint.is_finished = upper_id >= checkpoint.max_book_id
+            checkpoint.save()
+
+        yield checkpoint, updated_books, time.perf_counter() - start
@@ -0,0 +1,103 @@
+from django.db.models import F
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from main_app.models import Publisher, Author, Book
+
+
+def shift_counter(model, pks, field, delta):
+    if pks and delta:
+        model.objects.filter(pk__in=pks).update(**{field: F(field) + delta})
+
+
+COUNTED_BOOK_RELATIONS = (
+    ('publisher_id', Publisher, 'books_count'),
+    ('main_author_id', Author, 'main_books_count'),
+)
+
+
+def load_deferred_relations(instance):
+    deferred = instance.get_deferred_fields().intersection(attname for attname, _, _ in COUNTED_BOOK_RELATIONS)
+    if deferred:
+        instance.refresh_from_db(fields=deferred)
+
+
+@receiver(post_init, sender=Book)
+def remember_book_relations(sender, instance, **kwargs):
+    # Read __dict__ only: touching a deferred attribute would reload the row and fire post_init again.
+    instance._counted_relations = {
+        attname: instance.__dict__[attname]
+        for attname, _, _ in COUNTED_BOOK_RELATIONS
+        if attname in instance.__dict__
+    }
+
+
+@receiver(pre_save, sender=Book)
+def load_reassigned_book_relations(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+
+    # A relation deferred at load time and assigned since has no remembered value yet.
+    unknown = [
+        attname
+        for attname, _, _ in COUNTED_BOOK_RELATIONS
+        if attname in instance.__dict__ and attname not in instance._counted_relations
+    ]
+    if unknown:
+        instance._counted_relations.update(Book.objects.filter(pk=instance.pk).values(*unknown).first() or {})
+
+
+@receiver(post_save, sender=Book)
+def update_counters_on_book_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    remembered = {} if created else instance._counted_relations
+
+    for attname, model, counter in COUNTED_BOOK_RELATIONS:
+        # Still deferred means the save did not touch it.
+        if attname not in instance.__dict__:
+            continue
+
+        old_id, new_id = remembered.get(attname), instance.__dict__[attname]
+        if old_id != new_id:
+            shift_counter(model, [old_id], counter, -1)
+            shift_counter(model, [new_id], counter, 1)
+
+    remember_book_relations(sender, instance)
+
+
+@receiver(pre_delete, sender=Book)
+def update_co_author_counters_on_book_delete(sender, instance, **kwargs):
+    # The through rows go away with a fast delete that sends no m2m_changed.
+    Author.objects.filter(co_authors=instance).update(co_authored_count=F('co_authored_count') - 1)
+    # post_delete runs after the row is gone, too late to load deferred relations.
+    load_deferred_relations(instance)
+
+
+@receiver(post_delete, sender=Book)
+def update_counters_on_book_delete(sender, instance, **kwargs):
+    for attname, model, counter in COUNTED_BOOK_RELATIONS:
+        shift_counter(model, [getattr(instance, attname)], counter, -1)
+
+
+@receiver(m2m_changed, sender=Book.co_authors.through)
+def update_co_authored_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_add':
+        if reverse:
+            shift_counter(Author, [instance.pk], 'co_authored_count', len(pk_set))
+        else:
+            shift_counter(Author, pk_set, 'co_authored_count', 1)
+
+    elif action in ('pre_remove', 'pre_clear'):
+        # Only links that still exist are counted; remove() passes every requested pk.
+        if reverse:
+            books = instance.co_authors.all()
+            if action == 'pre_remove':
+                books = books.filter(pk__in=pk_set)
+            shift_counter(Author, [instance.pk], 'co_authored_count', -books.count())
+        else:
+            authors = Author.objects.filter(co_authors=instance)
+            if action == 'pre_remove':
+                authors = authors.filter(pk__in=pk_set)
+            authors.update(co_authored_count=F('co_authored_count') - 1)
@@ -1,3 +1,158 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+
+import caller
+from caller import get_top_main_author
+from main_app.bulk_loading import bulk_load_books
+from main_app.query_budget import query_budget, QueryBudgetExceeded
+from main_app.models import Publisher, Author, Book
+
+
+class TopMainAuthorReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        publisher = Publisher.objects.create(name='Penguin', established_date=datetime.date(1935, 7, 30))
+        top_author = Author.objects.create(name='Agatha')
+        other_author = Author.objects.create(name='Bernard')
+
+        for title, rating, author in (
+            ('First Mystery', 4.0, top_author),
+            ('Second Mystery', 3.0, top_author),
+            ('Lone Play', 5.0, other_author),
+        ):
+            Book.objects.create(
+                title=title,
+                publication_date=datetime.date(2020, 1, 1),
+                genre='Fiction',
+                price=10.00,
+                rating=rating,
+                publisher=publisher,
+                main_author=author,
+            )
+
+    def test_report_runs_in_one_query(self):
+        with self.assertNumQueries(1):
+            report = get_top_main_author()
+
+        self.assertEqual(
+            report,
+            "Top Author: Agatha, own book titles: First Mystery, Second Mystery, books average rating: 3.5",
+        )
+
+    def test_report_without_books(self):
+        Book.objects.all().delete()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_top_main_author(), "No results.")
+
+
+@override_settings(ENFORCE_QUERY_BUDGETS=True)
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        caller.populate_db()
+
+    def test_caller_reports_stay_within_budget(self):
+        for report in (
+            lambda: caller.get_publishers('a'),
+            caller.get_top_publisher,
+            caller.get_top_main_author,
+            caller.get_authors_by_books_count,
+            caller.get_bestseller,
+            caller.increase_price,
+        ):
+            with self.subTest(report=report):
+                report()
+
+    def test_exceeded_budget_fails(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget(1):
+                list(Publisher.objects.all())
+                list(Author.objects.all())
+
+    @override_settings(ENFORCE_QUERY_BUDGETS=False)
+    def test_decorator_is_inert_when_disabled(self):
+        @query_budget(0)
+        def two_queries():
+            return Publisher.objects.count() + Author.objects.count()
+
+        self.assertEqual(two_queries(), 4)
+
+
+class BookIndexTests(TestCase):
+    INDEXES = {
+        'book_publication_date_idx': (['publication_date'], ['ASC']),
+        'book_publisher_rating_idx': (['publisher_id', 'rating'], ['ASC', 'ASC']),
+        'book_main_author_rating_idx': (['main_author_id', 'rating'], ['ASC', 'ASC']),
+        'book_bestseller_rating_idx': (['rating', 'title'], ['DESC', 'ASC']),
+    }
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            self.constraints = connection.introspection.get_constraints(cursor, Book._meta.db_table)
+
+    def index_sql(self, name):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT indexdef FROM pg_indexes WHERE indexname = %s", [name])
+            else:
+                cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = %s", [name])
+            return cursor.fetchone()[0]
+
+    def test_indexes_cover_the_requested_columns_and_orders(self):
+        for name, (columns, orders) in self.INDEXES.items():
+            with self.subTest(index=name):
+                self.assertIn(name, self.constraints)
+                self.assertTrue(self.constraints[name]['index'])
+                self.assertEqual(self.constraints[name]['columns'], columns)
+                self.assertEqual(self.constraints[name]['orders'], orders)
+
+    def test_bestseller_index_is_partial(self):
+        self.assertRegex(self.index_sql('book_bestseller_rating_idx'), r'WHERE \(?"?is_bestseller"?')
+
+    def test_foreign_keys_have_no_standalone_indexes(self):
+        standalone = [
+            name for name, constraint in self.constraints.items()
+            if constraint['index'] and constraint['columns'] in (['publisher_id'], ['main_author_id'])
+        ]
+
+        self.assertEqual(standalone, [])
+
+
+class BulkLoadCounterTests(TestCase):
+    @staticmethod
+    def author_counts():
+        return {
+            name: (main, co)
+            for name, main, co in Author.objects.values_list('name', 'main_books_count', 'co_authored_count')
+        }
+
+    def test_counters_move_by_each_batch(self):
+        Publisher.objects.create(name='Penguin')
+        Publisher.objects.create(name='Vintage')
+        Author.objects.bulk_create(Author(name=name) for name in ('Agatha', 'Bernard', 'Colette'))
+        rows = [
+            {'title': f"Book {i}", 'publication_date': datetime.date(2020, 1, 1), 'genre': 'Fiction', 'price': 10,
+             'publisher': publisher, 'main_author': main_author, 'co_authors': co_authors}
+            for i, (publisher, main_author, co_authors) in enumerate((
+                ('Penguin', 'Agatha', ['Bernard', 'Bernard']),
+                ('Penguin', 'Agatha', []),
+                ('Vintage', 'Bernard', ['Agatha', 'Colette']),
+                ('Penguin', 'Colette', ['Bernard']),
+                ('Vintage', 'Agatha', ['Bernard', 'Colette']),
+            ))
+        ]
+
+        self.assertEqual(bulk_load_books(rows, batch_size=2), 5)
+
+        self.assertEqual(dict(Publisher.objects.values_list('name', 'books_count')), {'Penguin': 3, 'Vintage': 2})
+        counts = {
+            'Agatha': (3, 1),
+            'Bernard': (1, 3),
+            'Colette': (1, 2),
+        }
+        self.assertEqual(self.author_counts(), counts)
+        self.assertEqual(Author.objects.recount_books(), 3)
+        self.assertEqual(self.author_counts(), counts)
@@ -133,3 +133,6 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Turns the @query_budget checks on caller functions into hard failures; meant for tests.
+ENFORCE_QUERY_BUDGETS = False
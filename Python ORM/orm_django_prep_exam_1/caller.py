@@ -6,8 +6,11 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
 django.setup()
 
 from main_app.models import Profile, Product, Order
+from main_app.discounts import apply_discounts_in_batches
+from main_app.inventory import InsufficientStock
+from main_app.order_processing import complete_order_batch
 from decimal import Decimal
-from django.db.models import Q, Count, F, Case, When, Value
+from django.db.models import Q, Count
 
 
 def populate_db():
@@ -45,14 +48,12 @@ def populate_db():
 
     order1 = Order.objects.create(
         profile=profile1,
-        total_price=Decimal("1699.98"),
         is_completed=False,
     )
     order1.products.add(product1, product2)
 
     order2 = Order.objects.create(
         profile=profile2,
-        total_price=Decimal("199.99"),
         is_completed=True,
     )
     order2.products.add(product2)
@@ -66,18 +67,23 @@ def get_profiles(search_string=None):
         Q(full_name__icontains=search_string) |
         Q(email__icontains=search_string) |
         Q(phone_number__icontains=search_string)
-    )
+    ).annotate(num_of_orders=Count('order'))
 
     return '\n'.join(
-        f"Profile: {p.full_name}, email: {p.email}, phone number: {p.phone_number}, orders: {p.order_set.count()}"
+        f"Profile: {p.full_name}, email: {p.email}, phone number: {p.phone_number}, orders: {p.num_of_orders}"
         for p in profiles_match
     )
 
 
-def get_loyal_profiles():
+def get_loyal_profiles(cached=False):
+    if cached:
+        profiles = Profile.objects.get_cached_regular_customers(stale_ttl=60)
+    else:
+        profiles = Profile.objects.get_regular_customers().values('full_name', 'num_of_orders')
+
     return '\n'.join(
-        f"Profile: {p.full_name}, orders: {p.num_of_orders}"
-        for p in Profile.objects.get_regular_customers()
+        f"Profile: {p['full_name']}, orders: {p['num_of_orders']}"
+        for p in profiles
     )
 
 
@@ -101,36 +107,24 @@ def get_top_products():
         .order_by('-num_of_orders', 'name')
     )[:5]
 
-    return f"Top products:\n" + '\n'.join(f"{p.name}, sold {p.order_set.count()} times"
+    return f"Top products:\n" + '\n'.join(f"{p.name}, sold {p.num_of_orders} times"
                                           for p in top_products)
 
 
 def apply_discounts():
-    orders_to_discount = (
-        Order.objects.annotate(
-            num_of_orders=Count('products'),
-        ).filter(num_of_orders__gt=2, is_completed=False)
-        .update(total_price=F('total_price') * 0.9)
-    )
+    discounted_ids = apply_discounts_in_batches()
 
-    return f"Discount applied to {orders_to_discount} orders."
+    return f"Discount applied to {len(discounted_ids)} orders."
 
 
 def complete_order():
-    first_order = Order.objects.filter(is_completed=False).order_by('creation_date').first()
+    # An order deferred because another worker held its stock is claimed again.
+    while batch := complete_order_batch(batch_size=1):
+        if batch.completed:
+            return "Order has been completed!"
 
-    if not first_order:
-        return ''
-
-    first_order.is_completed = True
-    first_order.save()
-
-    first_order.products.update(
-        in_stock=F('in_stock') - 1,
-        is_available=Case(
-            When(in_stock=1, then=Value(False)),
-            default=F('is_available')
-        )
-    )
+        if batch.parked:
+            [product_ids] = batch.parked.values()
+            return f"Order is waiting for stock. {InsufficientStock(product_ids)}."
 
-    return "Order has been completed!"
+    return ''
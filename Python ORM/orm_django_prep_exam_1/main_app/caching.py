@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def leaderboard_cache():
+    return caches[settings.LEADERBOARD_CACHE]
+
+
+def get_or_refresh(key, compute, ttl, stale_ttl=0):
+    cache = leaderboard_cache()
+    entry = cache.get(key)
+    now = time.time()
+
+    if entry is not None:
+        if now < entry['fresh_until']:
+            return entry['value']
+
+        # Stale: one caller wins the refresh lock and recomputes, everyone else keeps serving the old value.
+        if not cache.add(f"{key}:refreshing", True, timeout=ttl):
+            return entry['value']
+
+    value = compute()
+    cache.set(
+        key,
+        {'value': value, 'fresh_until': now + ttl, 'expires_at': now + ttl + stale_ttl},
+        timeout=ttl + stale_ttl,
+    )
+    cache.delete(f"{key}:refreshing")
+
+    return value
+
+
+def invalidate(key):
+    cache = leaderboard_cache()
+    entry = cache.get(key)
+    if entry is None:
+        return
+
+    # Mark it stale rather than deleting it, so one reader refreshes under the lock while the rest
+    # keep the old value instead of all recomputing at once.
+    remaining = entry.get('expires_at', 0) - time.time()
+    if remaining > 0:
+        cache.set(key, {**entry, 'fresh_until': 0}, timeout=remaining)
+    else:
+        cache.delete(key)
@@ -0,0 +1,34 @@
+from django.db import connection, transaction
+
+from main_app.models import Order
+
+
+DISCOUNT_RATE = 0.9
+DISCOUNT_MIN_PRODUCTS = 2
+
+
+def discount_batch(after_id, batch_size):
+    table = Order._meta.db_table
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET discount_rate = discount_rate * %s, total_price = subtotal * discount_rate * %s"
+            f" WHERE id IN ("
+            f"  SELECT id FROM {table}"
+            f"  WHERE NOT is_completed AND products_count > %s AND id > %s"
+            f"  ORDER BY id LIMIT %s"
+            f" ) RETURNING id",
+            [DISCOUNT_RATE, DISCOUNT_RATE, DISCOUNT_MIN_PRODUCTS, after_id, batch_size],
+        )
+        return sorted(order_id for order_id, in cursor.fetchall())
+
+
+def apply_discounts_in_batches(batch_size=1000):
+    discounted = []
+    after_id = 0
+
+    while batch := discount_batch(after_id, batch_size):
+        discounted.extend(batch)
+        after_id = batch[-1]
+
+    return discounted
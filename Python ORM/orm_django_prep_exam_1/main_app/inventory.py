@@ -0,0 +1,342 @@
+import random
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Case, When, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.lookups import LessThanOrEqual
+
+from main_app.models import Order, Product, StockLedgerEntry, StockBucket
+
+
+OrderProduct = Order.products.through
+
+# Available stock is split over this many rows per product, so concurrent orders for a hot
+# product decrement different rows instead of queueing on one.
+STOCK_BUCKETS = 8
+
+
+class InsufficientStock(Exception):
+    def __init__(self, product_ids):
+        self.product_ids = sorted(product_ids)
+        super().__init__(f"Insufficient stock for product/s: {', '.join(map(str, self.product_ids))}")
+
+
+def pending_quantity():
+    return Coalesce(
+        Subquery(
+            StockLedgerEntry.objects.filter(product_id=OuterRef('id'), is_compacted=False)
+            .order_by()
+            .values('product_id')
+            .annotate(total=Sum('quantity'))
+            .values('total')
+        ),
+        Value(0),
+    )
+
+
+def ledger_stock(product_ids):
+    return dict(
+        Product.objects.filter(id__in=product_ids)
+        .annotate(available=F('in_stock') + pending_quantity())
+        .values_list('id', 'available')
+    )
+
+
+def split_stock(quantity):
+    share, extra = divmod(max(quantity, 0), STOCK_BUCKETS)
+    return [share + (slot < extra) for slot in range(STOCK_BUCKETS)]
+
+
+def lock_products(product_ids):
+    # Parking and anything that adds stock serialise on the product row, always after the
+    # buckets. NO KEY UPDATE leaves it free for the key-share checks of new ledger entries.
+    list(
+        Product.objects.filter(id__in=product_ids)
+        .order_by('id')
+        .select_for_update(no_key=True)
+        .values_list('id', flat=True)
+    )
+
+
+def wake_parked_orders(product_ids):
+    lock_products(product_ids)
+    Order.objects.filter(awaiting_stock=True, is_completed=False, products__in=product_ids).update(awaiting_stock=False)
+
+
+def reconcile_buckets(product_ids):
+    product_ids = sorted(set(product_ids))
+
+    with transaction.atomic():
+        StockBucket.objects.bulk_create(
+            (StockBucket(product_id=product_id, slot=slot, available=0)
+             for product_id in product_ids for slot in range(STOCK_BUCKETS)),
+            ignore_conflicts=True,
+        )
+        # Waits out the batches holding any of the buckets, so the ledger read below has their entries.
+        buckets = list(
+            StockBucket.objects.filter(product_id__in=product_ids)
+            .order_by('product_id', 'slot')
+            .select_for_update()
+            .values_list('id', 'product_id', 'slot', 'available')
+        )
+
+        targets = {product_id: max(quantity, 0) for product_id, quantity in ledger_stock(product_ids).items()}
+        current = Counter()
+        for _, product_id, _, available in buckets:
+            current[product_id] += available
+
+        drifted = [product_id for product_id in targets if current[product_id] != targets[product_id]]
+        StockBucket.objects.bulk_update(
+            [
+                StockBucket(id=bucket_id, available=split_stock(targets[product_id])[slot])
+                for bucket_id, product_id, slot, _ in buckets
+                if product_id in drifted
+            ],
+            ['available'],
+        )
+        wake_parked_orders([product_id for product_id in drifted if targets[product_id] > current[product_id]])
+
+    return drifted
+
+
+def drifted_products():
+    bucket_total = Subquery(
+        StockBucket.objects.filter(product_id=OuterRef('id'))
+        .order_by()
+        .values('product_id')
+        .annotate(total=Sum('available'))
+        .values('total')
+    )
+
+    return list(
+        Product.objects.alias(bucket_total=bucket_total, target=Greatest(F('in_stock') + pending_quantity(), 0))
+        .filter(bucket_total__isnull=False)
+        .exclude(bucket_total=F('target'))
+        .values_list('id', flat=True)
+    )
+
+
+def ensure_buckets(product_ids):
+    stocked = set(
+        StockBucket.objects.filter(product_id__in=product_ids).values_list('product_id', flat=True).distinct()
+    )
+    missing = set(product_ids) - stocked
+
+    if missing:
+        reconcile_buckets(missing)
+
+
+def available_stock(product_ids):
+    ensure_buckets(product_ids)
+
+    return dict(
+        StockBucket.objects.filter(product_id__in=product_ids)
+        .order_by()
+        .values('product_id')
+        .annotate(total=Sum('available'))
+        .values_list('product_id', 'total')
+    )
+
+
+def lock_stock(demand):
+    # One slot per batch first, picked at random, so concurrent workers spread over the buckets.
+    # Buckets held by another worker are skipped rather than waited for.
+    slot = random.randrange(STOCK_BUCKETS)
+    stocked = (
+        StockBucket.objects.filter(available__gt=0)
+        .order_by('product_id', 'slot')
+        .select_for_update(skip_locked=True)
+    )
+
+    buckets = list(stocked.filter(product_id__in=demand, slot=slot).values_list('id', 'product_id', 'available'))
+    held = Counter()
+    for _, product_id, available in buckets:
+        held[product_id] += available
+
+    wanting = [product_id for product_id, quantity in demand.items() if held[product_id] < quantity]
+    if wanting:
+        buckets.extend(
+            stocked.filter(product_id__in=wanting).exclude(slot=slot).values_list('id', 'product_id', 'available')
+        )
+
+    return buckets
+
+
+def take_stock(buckets, taken):
+    takes = {}
+    for bucket_id, product_id, available in buckets:
+        take = min(available, taken[product_id])
+        if take:
+            takes[bucket_id] = take
+            taken[product_id] -= take
+
+    if takes:
+        StockBucket.objects.filter(id__in=takes).update(
+            available=F('available') - Case(*(When(id=bucket_id, then=Value(take)) for bucket_id, take in takes.items()))
+        )
+
+
+def return_to_buckets(product_id, quantity):
+    for slot, share in enumerate(split_stock(quantity)):
+        if share:
+            StockBucket.objects.filter(product_id=product_id, slot=slot).update(available=F('available') + share)
+
+
+def reserve_lines(lines):
+    # Lines come oldest order first; each order gets all of its lines or none of them.
+    lines = list(lines)
+    if not lines:
+        return [], {}
+
+    with transaction.atomic():
+        demand = Counter(product_id for _, product_id in lines)
+        ensure_buckets(demand)
+        buckets = lock_stock(demand)
+
+        pool = Counter()
+        for _, product_id, available in buckets:
+            pool[product_id] += available
+
+        baskets = defaultdict(list)
+        for order_id, product_id in lines:
+            baskets[order_id].append(product_id)
+
+        granted, short = [], {}
+        for order_id, product_ids in baskets.items():
+            lacking = [product_id for product_id in product_ids if pool[product_id] < 1]
+            if lacking:
+                short[order_id] = lacking
+                continue
+
+            pool.subtract(product_ids)
+            granted.extend((order_id, product_id) for product_id in product_ids)
+
+        take_stock(buckets, Counter(product_id for _, product_id in granted))
+
+        entries = StockLedgerEntry.objects.bulk_create(
+            StockLedgerEntry(order_id=order_id, product_id=product_id, kind='Reserve', quantity=-1)
+            for order_id, product_id in granted
+        )
+        return entries, short
+
+
+def unreserved_lines(order_ids):
+    reserved = set(
+        StockLedgerEntry.objects.filter(order_id__in=order_ids, kind='Reserve')
+        .values_list('order_id', 'product_id')
+    )
+
+    return [
+        line
+        for line in OrderProduct.objects.filter(order_id__in=order_ids).values_list('order_id', 'product_id')
+        if line not in reserved
+    ]
+
+
+def reserve_order(order):
+    entries, short = reserve_lines(unreserved_lines([order.id]))
+    if short:
+        raise InsufficientStock(short[order.id])
+
+    return entries
+
+
+def commit_orders(order_ids):
+    rank = {order_id: position for position, order_id in enumerate(order_ids)}
+
+    with transaction.atomic():
+        _, short = reserve_lines(sorted(unreserved_lines(order_ids), key=lambda line: rank[line[0]]))
+        committed = [order_id for order_id in order_ids if order_id not in short]
+
+        StockLedgerEntry.objects.bulk_create(
+            StockLedgerEntry(order_id=order_id, product_id=product_id, kind='Commit', quantity=0)
+            for order_id, product_id in OrderProduct.objects.filter(order_id__in=committed)
+            .values_list('order_id', 'product_id')
+        )
+        return committed, short
+
+
+def park_orders(short):
+    if not short:
+        return {}
+
+    # Parked only if a product it lacks is sold out. Otherwise its stock sat in buckets another
+    # worker held, and the order stays pending for the next batch. Checked under the product lock,
+    # so a restock either lands before the check or runs its wake-up after this commits.
+    lacking = {product_id for product_ids in short.values() for product_id in product_ids}
+    lock_products(lacking)
+    remaining = available_stock(lacking)
+    parked = {
+        order_id: product_ids
+        for order_id, product_ids in short.items()
+        if any(remaining.get(product_id, 0) < 1 for product_id in product_ids)
+    }
+
+    Order.objects.filter(id__in=parked).update(awaiting_stock=True)
+    return parked
+
+
+def release_order(order):
+    with transaction.atomic():
+        settled = StockLedgerEntry.objects.filter(order=order, kind__in=('Commit', 'Release')).values('product_id')
+        reservations = list(
+            StockLedgerEntry.objects.filter(order=order, kind='Reserve').exclude(product_id__in=settled)
+            .values_list('product_id', 'quantity')
+        )
+
+        for product_id, quantity in reservations:
+            return_to_buckets(product_id, -quantity)
+
+        entries = StockLedgerEntry.objects.bulk_create(
+            StockLedgerEntry(order_id=order.id, product_id=product_id, kind='Release', quantity=-quantity)
+            for product_id, quantity in reservations
+        )
+        wake_parked_orders([product_id for product_id, _ in reservations])
+
+        return entries
+
+
+def restock(product, quantity):
+    with transaction.atomic():
+        ensure_buckets([product.id])
+        return_to_buckets(product.id, quantity)
+        entry = StockLedgerEntry.objects.create(product=product, kind='Restock', quantity=quantity)
+
+        # Orders parked for lack of stock get another try from the workers.
+        wake_parked_orders([product.id])
+
+        return entry
+
+
+def compact_ledger(batch_size=10_000):
+    with transaction.atomic():
+        entry_ids = list(
+            StockLedgerEntry.objects.filter(is_compacted=False)
+            .order_by('id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+
+        if not entry_ids:
+            return 0
+
+        entries = StockLedgerEntry.objects.filter(id__in=entry_ids)
+        change = Subquery(
+            entries.filter(product_id=OuterRef('id'))
+            .order_by()
+            .values('product_id')
+            .annotate(total=Sum('quantity'))
+            .values('total')
+        )
+
+        Product.objects.filter(id__in=entries.values('product_id')).update(
+            in_stock=F('in_stock') + change,
+            is_available=Case(
+                When(LessThanOrEqual(F('in_stock') + change, 0), then=Value(False)),
+                default=F('is_available')
+            )
+        )
+        entries.update(is_compacted=True)
+
+    return len(entry_ids)
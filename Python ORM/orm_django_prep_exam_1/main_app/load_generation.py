@@ -0,0 +1,105 @@
+import random
+from decimal import Decimal
+from itertools import accumulate
+
+from django.db import transaction
+
+from main_app.models import Profile, Product, Order
+
+
+OrderProduct = Order.products.through
+
+CITIES = ('Sofia', 'Plovdiv', 'Varna', 'Burgas', 'Ruse', 'Stara Zagora', 'Pleven', 'Sliven')
+
+
+def zipf_weights(size, exponent):
+    return list(accumulate(1 / rank ** exponent for rank in range(1, size + 1)))
+
+
+def batched_sizes(total, batch_size):
+    for start in range(0, total, batch_size):
+        yield min(batch_size, total - start)
+
+
+def generate_profiles(rng, total, batch_size):
+    ids = []
+
+    for size in batched_sizes(total, batch_size):
+        offset = len(ids)
+        profiles = Profile.objects.bulk_create(
+            Profile(
+                full_name=f"Customer {offset + i}",
+                email=f"customer{offset + i}@example.com",
+                phone_number=f"08{rng.randrange(10 ** 8):08d}",
+                address=f"{rng.choice(CITIES)}, Bulgaria",
+                is_active=rng.random() < 0.9,
+            )
+            for i in range(size)
+        )
+        ids.extend(p.id for p in profiles)
+
+    return ids
+
+
+def generate_products(rng, total, stock, batch_size):
+    products = []
+
+    for size in batched_sizes(total, batch_size):
+        offset = len(products)
+        created = Product.objects.bulk_create(
+            Product(
+                name=f"Product {offset + i}",
+                description='Generated product',
+                price=Decimal(rng.randrange(100, 500_000)) / 100,
+                in_stock=stock,
+            )
+            for i in range(size)
+        )
+        products.extend((p.id, p.price) for p in created)
+
+    return products
+
+
+def generate_orders(rng, total, profile_ids, products, zipf_exponent, max_products, completed_share, batch_size):
+    # Product popularity follows Zipf's law; customers are picked uniformly.
+    cum_weights = zipf_weights(len(products), zipf_exponent)
+    created = 0
+
+    for size in batched_sizes(total, batch_size):
+        baskets = [
+            sorted(set(rng.choices(products, cum_weights=cum_weights, k=rng.randint(1, max_products))))
+            for _ in range(size)
+        ]
+        # bulk_create skips the m2m signals, so the derived order fields are filled in here.
+        orders = Order.objects.bulk_create(
+            Order(
+                profile_id=rng.choice(profile_ids),
+                subtotal=sum(price for _, price in basket),
+                total_price=sum(price for _, price in basket),
+                products_count=len(basket),
+                is_completed=rng.random() < completed_share,
+            )
+            for basket in baskets
+        )
+        OrderProduct.objects.bulk_create(
+            OrderProduct(order_id=order.id, product_id=product_id)
+            for order, basket in zip(orders, baskets)
+            for product_id, _ in basket
+        )
+        created += len(orders)
+
+    return created
+
+
+def generate_dataset(profiles, products, orders, seed=42, zipf_exponent=1.1, max_products=5,
+                     completed_share=0.7, batch_size=10_000):
+    rng = random.Random(seed)
+
+    with transaction.atomic():
+        profile_ids = generate_profiles(rng, profiles, batch_size)
+        product_rows = generate_products(rng, products, orders * max_products, batch_size)
+        created_orders = generate_orders(
+            rng, orders, profile_ids, product_rows, zipf_exponent, max_products, completed_share, batch_size
+        )
+
+    return {'profiles': len(profile_ids), 'products': len(product_rows), 'orders': created_orders}
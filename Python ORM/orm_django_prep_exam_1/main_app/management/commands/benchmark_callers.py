@@ -0,0 +1,73 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+import caller
+from main_app.models import Profile, Product, Order
+
+
+CALLER_FUNCTIONS = (
+    ('get_profiles', ('Customer 1',)),
+    ('get_loyal_profiles', ()),
+    ('get_last_sold_products', ()),
+    ('get_top_products', ()),
+    ('apply_discounts', ()),
+    ('complete_order', ()),
+)
+
+
+class Command(BaseCommand):
+    help = 'Times every caller function against the current data and writes a JSON report to diff between commits.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=10)
+        parser.add_argument('--output', default='benchmark_report.json')
+
+    def handle(self, *args, **options):
+        report = {
+            'database': connection.vendor,
+            'rows': {
+                'profiles': Profile.objects.count(),
+                'products': Product.objects.count(),
+                'orders': Order.objects.count(),
+            },
+            'runs': options['runs'],
+            'functions': {},
+        }
+
+        for name, arguments in CALLER_FUNCTIONS:
+            report['functions'][name] = self.measure(getattr(caller, name), arguments, options['runs'])
+            self.stdout.write(
+                f"{name}: median {report['functions'][name]['median_ms']:.2f} ms,"
+                f" {report['functions'][name]['queries']} queries"
+            )
+
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+
+        self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+    @staticmethod
+    def measure(function, arguments, runs):
+        timings = []
+        queries = 0
+
+        for _ in range(runs):
+            # Every run is rolled back, so writing functions see the same data each time.
+            with transaction.atomic(), CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                function(*arguments)
+                timings.append((time.perf_counter() - start) * 1000)
+                queries = len(captured.captured_queries)
+                transaction.set_rollback(True)
+
+        return {
+            'median_ms': round(statistics.median(timings), 3),
+            'min_ms': round(min(timings), 3),
+            'max_ms': round(max(timings), 3),
+            'queries': queries,
+        }
@@ -0,0 +1,90 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from main_app.inventory import OrderProduct, available_stock
+from main_app.models import Profile, Product, Order, StockLedgerEntry
+from main_app.order_processing import run_worker_pool
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds pending orders and times the order workers at 1, 2, 4, ... processes, checking stock stays exact. '
+        'The seeded rows are deleted after each run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=20_000)
+        parser.add_argument('--products', type=int, default=200)
+        parser.add_argument('--max-workers', type=int, default=8)
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("The worker benchmark needs PostgreSQL for row locking.")
+
+        if Order.objects.filter(is_completed=False).exists():
+            raise CommandError("Complete or delete the pending orders before benchmarking.")
+
+        rng = random.Random(options['seed'])
+        workers = 1
+
+        while workers <= options['max_workers']:
+            # The workers commit from their own processes, so the seed cannot be rolled back; it is deleted instead.
+            profile, products = self.seed_orders(rng, options['orders'], options['products'])
+            try:
+                stock_before = self.total_stock(products)
+                lines = OrderProduct.objects.filter(order__is_completed=False).count()
+
+                start = time.perf_counter()
+                completed = run_worker_pool(workers, options['batch_size'])
+                elapsed = time.perf_counter() - start
+
+                sold = stock_before - self.total_stock(products)
+            finally:
+                self.remove_seed(profile, products)
+
+            status = 'OK' if completed == options['orders'] and sold == lines else 'MISMATCH'
+            self.stdout.write(
+                f"{workers} worker/s: {completed} orders in {elapsed:.2f} s"
+                f" ({completed / elapsed:.0f} orders/sec), stock sold {sold}/{lines} [{status}]"
+            )
+            workers *= 2
+
+    @staticmethod
+    def total_stock(products):
+        return sum(available_stock([p.id for p in products]).values())
+
+    @staticmethod
+    def seed_orders(rng, total_orders, total_products):
+        profile = Profile.objects.create(
+            full_name='Benchmark Buyer',
+            email='benchmark@example.com',
+            phone_number='0000000000',
+            address='Benchmark',
+        )
+        products = Product.objects.bulk_create(
+            Product(name=f"Benchmark product {i}", description='Benchmark', price=Decimal('9.99'), in_stock=total_orders)
+            for i in range(total_products)
+        )
+        orders = Order.objects.bulk_create(
+            Order(profile=profile, total_price=Decimal('9.99')) for _ in range(total_orders)
+        )
+        OrderProduct.objects.bulk_create(
+            OrderProduct(order_id=order.id, product_id=product.id)
+            for order in orders
+            for product in rng.sample(products, rng.randint(1, 3))
+        )
+
+        return profile, products
+
+    @staticmethod
+    def remove_seed(profile, products):
+        # Ledger entries first; deleting their orders would only null the order column.
+        StockLedgerEntry.objects.filter(product__in=products).delete()
+        profile.delete()
+        Product.objects.filter(pk__in=[product.pk for product in products]).delete()
@@ -0,0 +1,81 @@
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main_app.models import Profile, Product, Order
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares OFFSET and keyset (seek) paging of orders at shallow and deep pages. '
+        'Runs in one transaction that is rolled back, so the seeded rows are never kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--pages', type=int, nargs='+', default=[1, 100, 10_000])
+        parser.add_argument('--runs', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.benchmark(options)
+            transaction.set_rollback(True)
+
+    def benchmark(self, options):
+        page_size = options['page_size']
+        self.seed_orders(max(options['pages']) * page_size, options['batch_size'])
+
+        for page in options['pages']:
+            offset = (page - 1) * page_size
+            after = None
+            if offset:
+                # Where the previous page ended; a client would hold this as its cursor.
+                last = Order.objects.order_by('creation_date', 'id')[offset - 1]
+                after = Order.objects.encode_cursor(last)
+
+            offset_ms = self.time_runs(
+                lambda: list(Order.objects.order_by('creation_date', 'id')[offset:offset + page_size]),
+                options['runs'],
+            )
+            seek_ms = self.time_runs(lambda: Order.objects.seek(after=after, limit=page_size), options['runs'])
+
+            self.stdout.write(f"page {page}: offset {offset_ms:.2f} ms, seek {seek_ms:.2f} ms (median)")
+
+    @staticmethod
+    def time_runs(fetch, runs):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            fetch()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    @staticmethod
+    def seed_orders(total, batch_size):
+        missing = total - Order.objects.count()
+        if missing <= 0:
+            return
+
+        profile = Profile.objects.create(
+            full_name='Pagination Buyer',
+            email='pagination@example.com',
+            phone_number='0000000000',
+            address='Benchmark',
+        )
+        price = Decimal('9.99')
+        product = Product.objects.create(name='Pagination product', description='Benchmark', price=price, in_stock=0)
+
+        while missing > 0:
+            size = min(batch_size, missing)
+            orders = Order.objects.bulk_create(
+                Order(profile=profile, subtotal=price, total_price=price, products_count=1, is_completed=True)
+                for _ in range(size)
+            )
+            Order.products.through.objects.bulk_create(
+                Order.products.through(order_id=order.id, product_id=product.id) for order in orders
+            )
+            missing -= size
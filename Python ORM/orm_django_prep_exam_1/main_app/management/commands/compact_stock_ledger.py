@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from main_app.inventory import compact_ledger, drifted_products, reconcile_buckets
+
+
+class Command(BaseCommand):
+    help = ('Folds pending stock ledger entries into Product.in_stock and re-derives the stock buckets '
+            'of products whose in_stock was changed directly. Meant to run periodically.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        compacted = 0
+
+        while batch := compact_ledger(options['batch_size']):
+            compacted += batch
+
+        reconciled = reconcile_buckets(drifted_products())
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Compacted {compacted} stock ledger entr{'y' if compacted == 1 else 'ies'}, "
+            f"reconciled stock of {len(reconciled)} product/s."
+        ))
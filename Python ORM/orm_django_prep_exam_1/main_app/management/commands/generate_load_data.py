@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from main_app.load_generation import generate_dataset
+
+
+class Command(BaseCommand):
+    help = 'Bulk-inserts a deterministic synthetic dataset of profiles, products and orders.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=100_000)
+        parser.add_argument('--products', type=int, default=10_000)
+        parser.add_argument('--orders', type=int, default=1_000_000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--zipf-exponent', type=float, default=1.1)
+        parser.add_argument('--max-products', type=int, default=5)
+        parser.add_argument('--completed-share', type=float, default=0.7)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        created = generate_dataset(
+            options['profiles'],
+            options['products'],
+            options['orders'],
+            seed=options['seed'],
+            zipf_exponent=options['zipf_exponent'],
+            max_products=options['max_products'],
+            completed_share=options['completed_share'],
+            batch_size=options['batch_size'],
+        )
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created['profiles']} profiles, {created['products']} products"
+            f" and {created['orders']} orders in {elapsed:.1f} s."
+        ))
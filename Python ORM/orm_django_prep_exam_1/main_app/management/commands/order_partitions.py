@@ -0,0 +1,52 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from main_app import partitioning
+from main_app.models import Order
+
+
+class Command(BaseCommand):
+    help = (
+        'Maintains the monthly order partitions created by migration 0009_order_partitioning '
+        '(PARTITION_ORDERS): pre-create and detach partitions, or EXPLAIN a time-bounded query.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=('maintain', 'explain'))
+        parser.add_argument('--months-ahead', type=int, default=3)
+        parser.add_argument('--retain-months', type=int, default=24)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Order partitioning needs PostgreSQL.")
+
+        if not partitioning.is_partitioned():
+            raise CommandError(
+                "The order table is not partitioned. Set PARTITION_ORDERS = True and apply"
+                " main_app migration 0009_order_partitioning."
+            )
+
+        action = options['action']
+
+        if action == 'maintain':
+            created = partitioning.ensure_partitions(options['months_ahead'])
+            detached = partitioning.detach_partitions(options['retain_months'])
+            self.stdout.write(f"Partitions ensured: {', '.join(created)}")
+            self.stdout.write(f"Partitions detached: {', '.join(detached) or 'none'}")
+            return
+
+        # Last week's orders should touch only the current month's partition (or two at a month boundary).
+        now = timezone.now()
+        plan = Order.objects.filter(
+            creation_date__gte=now - datetime.timedelta(days=7),
+            creation_date__lt=now,
+        ).explain()
+        scanned = [name for name in partitioning.partitions() if name in plan]
+
+        self.stdout.write(plan)
+        self.stdout.write(
+            f"Scanned {len(scanned)} of {len(partitioning.partitions())} partition/s: {', '.join(scanned)}"
+        )
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from main_app.order_processing import run_worker_pool
+
+
+class Command(BaseCommand):
+    help = 'Completes pending orders with a pool of workers that claim batches with SKIP LOCKED.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        completed = run_worker_pool(options['workers'], options['batch_size'])
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{completed} order/s completed by {options['workers']} worker/s"
+            f" in {elapsed:.2f} s ({completed / elapsed:.0f} orders/sec)."
+        ))
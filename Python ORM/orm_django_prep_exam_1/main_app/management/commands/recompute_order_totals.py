@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from main_app.models import Order
+
+
+class Command(BaseCommand):
+    help = 'Recomputes Order.subtotal and total_price from the prices of its products, one id range at a time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        max_id = Order.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        updated = 0
+
+        for lower_id in range(0, max_id, batch_size):
+            with transaction.atomic():
+                updated += Order.objects.filter(
+                    id__gt=lower_id,
+                    id__lte=lower_id + batch_size,
+                ).recompute_totals()
+
+        self.stdout.write(self.style.SUCCESS(f"Recomputed totals for {updated} order/s."))
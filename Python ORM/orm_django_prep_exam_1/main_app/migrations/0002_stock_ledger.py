@@ -0,0 +1,29 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('creation_date', models.DateTimeField(auto_now_add=True)),
+                ('kind', models.CharField(choices=[('Reserve', 'Reserve'), ('Commit', 'Commit'), ('Release', 'Release'), ('Restock', 'Restock')], max_length=7)),
+                ('quantity', models.IntegerField()),
+                ('is_compacted', models.BooleanField(default=False)),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_entries', to='main_app.order')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_entries', to='main_app.product')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('is_compacted', False)), fields=['product'], name='stock_entry_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:19
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_stock_ledger'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='total_price',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10, validators=[django.core.validators.MinValueValidator(0.01)]),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_order_total_default'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['creation_date', 'id'], name='order_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_order_pending_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['creation_date', 'id'], name='main_app_order_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['creation_date', 'id'], name='main_app_product_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['creation_date', 'id'], name='main_app_profile_seek_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_seek_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='products_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('is_completed', False), ('products_count__gt', 2)), fields=['id'], name='order_discountable_idx'),
+        ),
+        migrations.RunSQL(
+            sql=(
+                "UPDATE main_app_order SET products_count = ("
+                " SELECT COUNT(*) FROM main_app_order_products"
+                " WHERE main_app_order_products.order_id = main_app_order.id)"
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
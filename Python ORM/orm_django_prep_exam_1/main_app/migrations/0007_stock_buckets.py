@@ -0,0 +1,48 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0006_order_products_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot', models.PositiveSmallIntegerField()),
+                ('available', models.IntegerField()),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='order',
+            name='order_pending_idx',
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='awaiting_stock',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('awaiting_stock', False), ('is_completed', False)), fields=['creation_date', 'id'], name='order_pending_idx'),
+        ),
+        migrations.AddField(
+            model_name='stockbucket',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_buckets', to='main_app.product'),
+        ),
+        migrations.AddConstraint(
+            model_name='stockbucket',
+            constraint=models.UniqueConstraint(fields=('product', 'slot'), name='stock_bucket_product_slot_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='stockbucket',
+            constraint=models.CheckConstraint(check=models.Q(('available__gte', 0)), name='stock_bucket_available_gte_0'),
+        ),
+    ]
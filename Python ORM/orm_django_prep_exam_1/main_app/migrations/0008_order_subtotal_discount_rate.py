@@ -0,0 +1,36 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:41
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0007_stock_buckets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='discount_rate',
+            field=models.DecimalField(decimal_places=4, default=Decimal('1.0000'), max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10),
+        ),
+        migrations.RunSQL(
+            sql=[
+                "UPDATE main_app_order SET subtotal = COALESCE(("
+                " SELECT SUM(main_app_product.price) FROM main_app_order_products"
+                " JOIN main_app_product ON main_app_product.id = main_app_order_products.product_id"
+                " WHERE main_app_order_products.order_id = main_app_order.id), 0)",
+                # Totals already discounted keep their discount as a rate.
+                "UPDATE main_app_order SET discount_rate = ROUND(total_price / subtotal, 4)"
+                " WHERE subtotal > 0 AND total_price < subtotal",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import migrations
+
+from main_app import partitioning
+
+
+def partition_orders(apps, schema_editor):
+    if not settings.PARTITION_ORDERS or schema_editor.connection.vendor != 'postgresql':
+        return
+
+    if not partitioning.is_partitioned():
+        partitioning.convert_to_partitioned()
+
+
+def unpartition_orders(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    if partitioning.is_partitioned():
+        partitioning.convert_to_unpartitioned()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0008_order_subtotal_discount_rate'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_orders, unpartition_orders),
+    ]
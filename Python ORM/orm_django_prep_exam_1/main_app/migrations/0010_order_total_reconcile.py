@@ -0,0 +1,38 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:58
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0009_order_partitioning'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='total_price',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.RunSQL(
+            sql=[
+                "UPDATE main_app_order SET"
+                " subtotal = COALESCE(("
+                "  SELECT SUM(main_app_product.price) FROM main_app_order_products"
+                "  JOIN main_app_product ON main_app_product.id = main_app_order_products.product_id"
+                "  WHERE main_app_order_products.order_id = main_app_order.id), 0),"
+                " products_count = ("
+                "  SELECT COUNT(*) FROM main_app_order_products"
+                "  WHERE main_app_order_products.order_id = main_app_order.id)",
+                # A total below the list price is a discount; anything else had no discount to keep.
+                "UPDATE main_app_order SET discount_rate = CASE"
+                " WHEN subtotal > 0 AND total_price < subtotal THEN ROUND(total_price / subtotal, 4)"
+                " ELSE 1 END",
+                "UPDATE main_app_order SET total_price = subtotal * discount_rate",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
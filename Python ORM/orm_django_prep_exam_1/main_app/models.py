@@ -1,24 +1,107 @@
+import datetime
+from collections import namedtuple
+from decimal import Decimal
+
+from django.core import signing
 from django.db import models
 from django.core.validators import MinValueValidator
-from django.db.models import Count
+from django.db.models import Count, Sum, OuterRef, Subquery, Value, Q, F
+from django.db.models.functions import Coalesce
+
+from main_app.caching import get_or_refresh
+
+
+SeekPage = namedtuple('SeekPage', ['items', 'next_cursor'])
+
+
+class TimeStampedQuerySet(models.QuerySet):
+    def seek(self, after=None, limit=100):
+        if isinstance(after, str):
+            after = self.decode_cursor(after)
+
+        rows = self.order_by('creation_date', 'id')
+
+        if after is not None:
+            creation_date, pk = after
+            # The leading >= keeps the (creation_date, id) index range usable despite the OR.
+            rows = rows.filter(
+                Q(creation_date__gt=creation_date) | Q(creation_date=creation_date, id__gt=pk),
+                creation_date__gte=creation_date,
+            )
+
+        items = list(rows[:limit + 1])
+        if len(items) <= limit:
+            return SeekPage(items, None)
+
+        items = items[:limit]
+        return SeekPage(items, self.encode_cursor(items[-1]))
+
+    @staticmethod
+    def encode_cursor(obj):
+        return signing.dumps([obj.creation_date.isoformat(), obj.id], salt='main_app.seek', compress=True)
+
+    @staticmethod
+    def decode_cursor(cursor):
+        creation_date, pk = signing.loads(cursor, salt='main_app.seek')
+        return datetime.datetime.fromisoformat(creation_date), pk
 
 
 class TimeStampedModel(models.Model):
     creation_date = models.DateTimeField(auto_now_add=True)
 
+    objects = TimeStampedQuerySet.as_manager()
+
     class Meta:
         abstract = True
+        indexes = [
+            models.Index(fields=['creation_date', 'id'], name='%(app_label)s_%(class)s_seek_idx'),
+        ]
+
+
+REGULAR_CUSTOMERS_CACHE_KEY = 'regular_customers'
 
 
-class ProfileManager(models.Manager):
+class ProfileManager(models.Manager.from_queryset(TimeStampedQuerySet)):
     def get_regular_customers(self):
         return (
             self.annotate(num_of_orders=Count('order'))
             .filter(num_of_orders__gt=2).order_by('-num_of_orders')
         )
 
+    def get_cached_regular_customers(self, ttl=300, stale_ttl=0):
+        return get_or_refresh(
+            REGULAR_CUSTOMERS_CACHE_KEY,
+            lambda: list(self.get_regular_customers().values('full_name', 'num_of_orders')),
+            ttl,
+            stale_ttl,
+        )
+
+
+class OrderQuerySet(TimeStampedQuerySet):
+    def recompute_totals(self):
+        products = (
+            Product.objects.filter(order=OuterRef('pk'))
+            .order_by()
+            .values('order')
+        )
+        subtotal = Coalesce(
+            Subquery(products.annotate(total=Sum('price')).values('total')),
+            Value(Decimal('0.00')),
+        )
+
+        return self.update(
+            subtotal=subtotal,
+            total_price=subtotal * F('discount_rate'),
+            products_count=Coalesce(
+                Subquery(products.annotate(count=Count('id')).values('count')),
+                Value(0),
+            ),
+        )
 
 
+class OrderManager(models.Manager.from_queryset(OrderQuerySet)):
+    pass
+
 
 class Profile(TimeStampedModel):
     full_name = models.CharField(max_length=100)
@@ -50,11 +133,72 @@ class Product(TimeStampedModel):
 class Order(TimeStampedModel):
     profile = models.ForeignKey(Profile, on_delete=models.CASCADE)
     products = models.ManyToManyField(Product)
+    # List price of the products; total_price is always subtotal * discount_rate.
+    subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    discount_rate = models.DecimalField(max_digits=5, decimal_places=4, default=Decimal('1.0000'))
     total_price = models.DecimalField(
         max_digits=10, decimal_places=2,
-        validators=[MinValueValidator(0.01)]
+        default=Decimal('0.00'),
+        validators=[MinValueValidator(0)]
     )
     is_completed = models.BooleanField(default=False)
+    awaiting_stock = models.BooleanField(default=False)
+    products_count = models.PositiveIntegerField(default=0)
+
+    objects = OrderManager()
+
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            *TimeStampedModel.Meta.indexes,
+            models.Index(
+                fields=['creation_date', 'id'],
+                name='order_pending_idx',
+                condition=models.Q(is_completed=False, awaiting_stock=False),
+            ),
+            models.Index(
+                fields=['id'],
+                name='order_discountable_idx',
+                condition=models.Q(is_completed=False, products_count__gt=2),
+            ),
+        ]
 
     def __str__(self):
         return f"Order #{self.id}"
+
+
+class StockLedgerEntry(TimeStampedModel):
+    KIND_CHOICES = (
+        ('Reserve', 'Reserve'),
+        ('Commit', 'Commit'),
+        ('Release', 'Release'),
+        ('Restock', 'Restock'),
+    )
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='stock_entries')
+    order = models.ForeignKey(Order, null=True, blank=True, on_delete=models.SET_NULL, related_name='stock_entries')
+    kind = models.CharField(max_length=7, choices=KIND_CHOICES)
+    quantity = models.IntegerField()
+    is_compacted = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['product'], condition=models.Q(is_compacted=False), name='stock_entry_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.quantity} of {self.product_id}"
+
+
+class StockBucket(models.Model):
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='stock_buckets')
+    slot = models.PositiveSmallIntegerField()
+    available = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'slot'], name='stock_bucket_product_slot_uniq'),
+            models.CheckConstraint(check=models.Q(available__gte=0), name='stock_bucket_available_gte_0'),
+        ]
+
+    def __str__(self):
+        return f"{self.available} of {self.product_id} in slot {self.slot}"
@@ -0,0 +1,49 @@
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections, transaction
+
+from main_app.inventory import commit_orders, park_orders
+from main_app.models import Order
+
+
+OrderBatch = namedtuple('OrderBatch', ['completed', 'parked', 'deferred'])
+
+
+def complete_order_batch(batch_size=100):
+    with transaction.atomic():
+        # Orders locked by another worker are skipped, so each order is completed exactly once.
+        order_ids = list(
+            Order.objects.filter(is_completed=False, awaiting_stock=False)
+            .order_by('creation_date', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+
+        if not order_ids:
+            return None
+
+        # Stock for the whole batch is taken from the buckets in one UPDATE; short orders get none.
+        completed, short = commit_orders(order_ids)
+        Order.objects.filter(id__in=completed).update(is_completed=True)
+        parked = park_orders(short)
+
+    return OrderBatch(completed, parked, [order_id for order_id in short if order_id not in parked])
+
+
+def run_worker(batch_size=100):
+    completed = 0
+
+    while batch := complete_order_batch(batch_size):
+        completed += len(batch.completed)
+
+    return completed
+
+
+def run_worker_pool(workers, batch_size=100):
+    # Forked workers must not share the parent's connection; each one opens its own.
+    connections.close_all()
+
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as pool:
+        return sum(pool.map(run_worker, [batch_size] * workers))
@@ -0,0 +1,289 @@
+import datetime
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from main_app.models import Order
+
+
+ORDER_TABLE = Order._meta.db_table
+LEGACY_TABLE = f"{ORDER_TABLE}_unpartitioned"
+# Catches rows past the last monthly partition, so inserts keep working if maintenance is late.
+DEFAULT_PARTITION = f"{ORDER_TABLE}_pdefault"
+
+
+def month_start(day):
+    return datetime.date(day.year, day.month, 1)
+
+
+def add_months(day, months):
+    month_index = day.year * 12 + day.month - 1 + months
+    return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{ORDER_TABLE}_p{month:%Y_%m}"
+
+
+def month_of_partition(name):
+    return datetime.datetime.strptime(name[len(ORDER_TABLE) + 2:], '%Y_%m').date()
+
+
+def is_partitioned():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)",
+            [ORDER_TABLE],
+        )
+        return cursor.fetchone()[0]
+
+
+def partitions():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " WHERE pg_inherits.inhparent = %s::regclass ORDER BY child.relname",
+            [ORDER_TABLE],
+        )
+        return [name for name, in cursor.fetchall()]
+
+
+def monthly_partitions():
+    return [name for name in partitions() if name != DEFAULT_PARTITION]
+
+
+def table_exists(cursor, name):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+    return cursor.fetchone()[0]
+
+
+def create_partition(cursor, month):
+    name = partition_name(month)
+    if table_exists(cursor, name):
+        return
+
+    lower = f"'{month:%Y-%m-%d} 00:00:00+00'"
+    upper = f"'{add_months(month, 1):%Y-%m-%d} 00:00:00+00'"
+
+    # No INCLUDING DEFAULTS: inserts go through the parent, and a detached partition must not depend on its sequence.
+    cursor.execute(f"CREATE TABLE {name} (LIKE {ORDER_TABLE} INCLUDING CONSTRAINTS)")
+
+    # PostgreSQL refuses a partition whose range still has rows in the default partition,
+    # so those rows move over before it is attached.
+    if table_exists(cursor, DEFAULT_PARTITION):
+        cursor.execute(
+            f"WITH moved AS ("
+            f" DELETE FROM {DEFAULT_PARTITION} WHERE creation_date >= {lower} AND creation_date < {upper}"
+            f" RETURNING *"
+            f") INSERT INTO {name} SELECT * FROM moved"
+        )
+
+    cursor.execute(f"ALTER TABLE {ORDER_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper})")
+
+
+def ensure_partitions(months_ahead=3, today=None):
+    current = month_start(today or datetime.date.today())
+    months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for month in months:
+            create_partition(cursor, month)
+
+    return [partition_name(month) for month in months]
+
+
+def detach_partitions(retain_months=24, today=None):
+    cutoff = add_months(month_start(today or datetime.date.today()), -retain_months)
+    detached = [name for name in monthly_partitions() if month_of_partition(name) < cutoff]
+
+    # Detached partitions stay behind as plain tables, ready to be archived or dropped.
+    with transaction.atomic(), connection.cursor() as cursor:
+        for name in detached:
+            cursor.execute(f"ALTER TABLE {ORDER_TABLE} DETACH PARTITION {name}")
+
+    return detached
+
+
+# Foreign keys cannot reference id alone on a partitioned table, so the keys pointing at orders
+# are replaced by constraint triggers that check the same thing, deferred like Django's keys.
+REFERENCE_CHECK_FUNCTION = f"{ORDER_TABLE}_reference_exists"
+ORDER_DELETE_CHECK_FUNCTION = f"{ORDER_TABLE}_unreferenced"
+ORDER_DELETE_CHECK_TRIGGER = f"{ORDER_TABLE}_unreferenced_check"
+
+
+def create_reference_check_functions(cursor):
+    cursor.execute(
+        f"CREATE FUNCTION {REFERENCE_CHECK_FUNCTION}() RETURNS trigger LANGUAGE plpgsql AS $$"
+        f" DECLARE order_id bigint;"
+        f" BEGIN"
+        f"  EXECUTE format('SELECT ($1).%I', TG_ARGV[0]) INTO order_id USING NEW;"
+        f"  IF order_id IS NOT NULL THEN"
+        f"   PERFORM 1 FROM {ORDER_TABLE} WHERE id = order_id FOR KEY SHARE;"
+        f"   IF NOT FOUND THEN"
+        f"    RAISE foreign_key_violation USING MESSAGE = format("
+        f"     '%s.%s = %s is not present in {ORDER_TABLE}', TG_TABLE_NAME, TG_ARGV[0], order_id);"
+        f"   END IF;"
+        f"  END IF;"
+        f"  RETURN NULL;"
+        f" END $$"
+    )
+    # TG_ARGV holds (table, column) pairs. A row that only moved to another partition still exists by id.
+    cursor.execute(
+        f"CREATE FUNCTION {ORDER_DELETE_CHECK_FUNCTION}() RETURNS trigger LANGUAGE plpgsql AS $$"
+        f" DECLARE referenced boolean;"
+        f" BEGIN"
+        f"  IF EXISTS (SELECT 1 FROM {ORDER_TABLE} WHERE id = OLD.id) THEN"
+        f"   RETURN NULL;"
+        f"  END IF;"
+        f"  FOR i IN 0 .. TG_NARGS - 1 BY 2 LOOP"
+        f"   EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE %I = $1)', TG_ARGV[i], TG_ARGV[i + 1])"
+        f"    INTO referenced USING OLD.id;"
+        f"   IF referenced THEN"
+        f"    RAISE foreign_key_violation USING MESSAGE = format("
+        f"     '{ORDER_TABLE}.id = %s is still referenced from %s', OLD.id, TG_ARGV[i]);"
+        f"   END IF;"
+        f"  END LOOP;"
+        f"  RETURN NULL;"
+        f" END $$"
+    )
+
+
+def incoming_foreign_keys(cursor):
+    cursor.execute(
+        "SELECT c.conrelid::regclass::text, c.conname, a.attname FROM pg_constraint c"
+        " JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]"
+        " WHERE c.confrelid = %s::regclass AND c.contype = 'f' ORDER BY c.conname",
+        [ORDER_TABLE],
+    )
+    return cursor.fetchall()
+
+
+def reference_check_triggers(cursor):
+    # The triggers keep the names of the foreign keys they replace.
+    cursor.execute(
+        "SELECT t.tgrelid::regclass::text, t.tgname, a.attname FROM pg_trigger t"
+        " JOIN pg_attribute a ON a.attrelid = t.tgrelid AND a.attnum = t.tgattr[0]"
+        " WHERE t.tgfoid = %s::regproc ORDER BY t.tgname",
+        [REFERENCE_CHECK_FUNCTION],
+    )
+    return cursor.fetchall()
+
+
+def outgoing_foreign_keys(cursor):
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [ORDER_TABLE],
+    )
+    return cursor.fetchall()
+
+
+def index_definitions(cursor, exclude):
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND NOT indexname = ANY(%s)",
+        [ORDER_TABLE, list(exclude)],
+    )
+    # Indexes of a partitioned table are listed as ON ONLY the parent.
+    return [definition.replace(' ON ONLY ', ' ON ') for definition, in cursor.fetchall()]
+
+
+def convert_to_partitioned(months_ahead=3):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {ORDER_TABLE} IN ACCESS EXCLUSIVE MODE")
+        indexes = index_definitions(cursor, [f"{ORDER_TABLE}_pkey"])
+        # LIKE ... INCLUDING CONSTRAINTS copies CHECK constraints only, so foreign keys are re-added by hand.
+        foreign_keys = outgoing_foreign_keys(cursor)
+        references = incoming_foreign_keys(cursor)
+        cursor.execute(f"SELECT MIN(creation_date) FROM {ORDER_TABLE}")
+        oldest = cursor.fetchone()[0]
+
+        for table, name, _ in references:
+            cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT {name}")
+
+        cursor.execute(f"ALTER TABLE {ORDER_TABLE} RENAME TO {LEGACY_TABLE}")
+        cursor.execute(f"ALTER TABLE {LEGACY_TABLE} RENAME CONSTRAINT {ORDER_TABLE}_pkey TO {LEGACY_TABLE}_pkey")
+        # The partition key has to be part of the primary key, so it becomes (id, creation_date).
+        cursor.execute(
+            f"CREATE TABLE {ORDER_TABLE} ("
+            f" LIKE {LEGACY_TABLE} INCLUDING CONSTRAINTS,"
+            f" PRIMARY KEY (id, creation_date)"
+            f") PARTITION BY RANGE (creation_date)"
+        )
+
+        month = month_start(oldest.date() if oldest else datetime.date.today())
+        last_month = add_months(month_start(datetime.date.today()), months_ahead)
+        while month <= last_month:
+            create_partition(cursor, month)
+            month = add_months(month, 1)
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {ORDER_TABLE} DEFAULT")
+
+        cursor.execute(f"INSERT INTO {ORDER_TABLE} SELECT * FROM {LEGACY_TABLE}")
+        cursor.execute(f"DROP TABLE {LEGACY_TABLE}")
+
+        # Outgoing keys such as profile_id -> main_app_profile are still valid on a partitioned table.
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {ORDER_TABLE} ADD CONSTRAINT {name} {definition}")
+
+        # Identity columns need PostgreSQL 17 on a partitioned table; a sequence works everywhere.
+        cursor.execute(f"CREATE SEQUENCE {ORDER_TABLE}_id_seq OWNED BY {ORDER_TABLE}.id")
+        cursor.execute(f"ALTER TABLE {ORDER_TABLE} ALTER COLUMN id SET DEFAULT nextval('{ORDER_TABLE}_id_seq')")
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Order]):
+            cursor.execute(sql)
+
+        for definition in indexes:
+            cursor.execute(definition)
+        # Lookups by id alone (the reference checks, Django's pk filters) cannot use the (id, creation_date) key.
+        cursor.execute(f"CREATE INDEX {ORDER_TABLE}_id_idx ON {ORDER_TABLE} (id)")
+
+        create_reference_check_functions(cursor)
+        for table, name, column in references:
+            cursor.execute(
+                f"CREATE CONSTRAINT TRIGGER {name} AFTER INSERT OR UPDATE OF {column} ON {table}"
+                f" DEFERRABLE INITIALLY DEFERRED FOR EACH ROW"
+                f" EXECUTE FUNCTION {REFERENCE_CHECK_FUNCTION}('{column}')"
+            )
+        if references:
+            arguments = ', '.join(f"'{table}', '{column}'" for table, _, column in references)
+            cursor.execute(
+                f"CREATE CONSTRAINT TRIGGER {ORDER_DELETE_CHECK_TRIGGER} AFTER DELETE OR UPDATE OF id ON {ORDER_TABLE}"
+                f" DEFERRABLE INITIALLY DEFERRED FOR EACH ROW"
+                f" EXECUTE FUNCTION {ORDER_DELETE_CHECK_FUNCTION}({arguments})"
+            )
+
+
+def convert_to_unpartitioned():
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {ORDER_TABLE} IN ACCESS EXCLUSIVE MODE")
+        indexes = index_definitions(cursor, [f"{ORDER_TABLE}_pkey", f"{ORDER_TABLE}_id_idx"])
+        foreign_keys = outgoing_foreign_keys(cursor)
+        references = reference_check_triggers(cursor)
+
+        for table, name, _ in references:
+            cursor.execute(f"DROP TRIGGER {name} ON {table}")
+
+        # Without INCLUDING DEFAULTS, so the copy does not depend on the sequence dropped with the old table.
+        cursor.execute(
+            f"CREATE TABLE {LEGACY_TABLE} ("
+            f" LIKE {ORDER_TABLE} INCLUDING CONSTRAINTS,"
+            f" CONSTRAINT {LEGACY_TABLE}_pkey PRIMARY KEY (id)"
+            f")"
+        )
+        cursor.execute(f"INSERT INTO {LEGACY_TABLE} SELECT * FROM {ORDER_TABLE}")
+        cursor.execute(f"DROP TABLE {ORDER_TABLE}")
+        cursor.execute(f"DROP FUNCTION {REFERENCE_CHECK_FUNCTION}(), {ORDER_DELETE_CHECK_FUNCTION}()")
+
+        cursor.execute(f"ALTER TABLE {LEGACY_TABLE} RENAME TO {ORDER_TABLE}")
+        cursor.execute(f"ALTER TABLE {ORDER_TABLE} RENAME CONSTRAINT {LEGACY_TABLE}_pkey TO {ORDER_TABLE}_pkey")
+        cursor.execute(f"ALTER TABLE {ORDER_TABLE} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Order]):
+            cursor.execute(sql)
+
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {ORDER_TABLE} ADD CONSTRAINT {name} {definition}")
+        for definition in indexes:
+            cursor.execute(definition)
+        for table, name, column in references:
+            cursor.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column})"
+                f" REFERENCES {ORDER_TABLE} (id) DEFERRABLE INITIALLY DEFERRED"
+            )
@@ -0,0 +1,72 @@
+from django.db.models import F, Sum, Count
+from django.db.models.signals import m2m_changed, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from main_app.caching import invalidate
+from main_app.inventory import reconcile_buckets
+from main_app.models import Order, Product, REGULAR_CUSTOMERS_CACHE_KEY
+
+
+def shift_order_totals(order_ids, amount, products):
+    if order_ids and products:
+        # Both SETs read the old subtotal, so the discount applies to the new list price.
+        Order.objects.filter(pk__in=order_ids).update(
+            subtotal=F('subtotal') + amount,
+            total_price=(F('subtotal') + amount) * F('discount_rate'),
+            products_count=F('products_count') + products,
+        )
+
+
+@receiver(m2m_changed, sender=Order.products.through)
+def update_order_total(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'pre_remove', 'pre_clear'):
+        return
+
+    if reverse:
+        # A product joined or left some orders: move each of those orders by its price.
+        if action == 'post_add':
+            order_ids = pk_set
+        else:
+            orders = instance.order_set.all()
+            if action == 'pre_remove':
+                orders = orders.filter(pk__in=pk_set)
+            order_ids = list(orders.values_list('pk', flat=True))
+
+        sign = 1 if action == 'post_add' else -1
+        shift_order_totals(order_ids, sign * instance.price, sign)
+        return
+
+    # remove() and clear() are priced before the rows go, and only for products still on the order.
+    products = Product.objects.filter(pk__in=pk_set) if action == 'post_add' else instance.products.all()
+    if action == 'pre_remove':
+        products = products.filter(pk__in=pk_set)
+
+    changed = products.aggregate(total=Sum('price'), count=Count('id'))
+    if changed['count']:
+        sign = 1 if action == 'post_add' else -1
+        shift_order_totals([instance.pk], sign * changed['total'], sign * changed['count'])
+        instance.refresh_from_db(fields=['subtotal', 'total_price', 'products_count'])
+
+
+@receiver(pre_delete, sender=Product)
+def update_order_totals_on_product_delete(sender, instance, **kwargs):
+    # The through rows go away with a fast delete that sends no m2m_changed.
+    shift_order_totals(list(instance.order_set.values_list('pk', flat=True)), -instance.price, -1)
+
+
+@receiver(post_save, sender=Product)
+def reconcile_stock_buckets(sender, instance, raw=False, update_fields=None, **kwargs):
+    # A direct write to in_stock (admin, seeding scripts) is carried into the buckets.
+    if not raw and (update_fields is None or 'in_stock' in update_fields):
+        reconcile_buckets([instance.pk])
+
+
+@receiver(post_save, sender=Order)
+def invalidate_regular_customers_on_create(sender, instance, created, **kwargs):
+    if created:
+        invalidate(REGULAR_CUSTOMERS_CACHE_KEY)
+
+
+@receiver(post_delete, sender=Order)
+def invalidate_regular_customers_on_delete(sender, instance, **kwargs):
+    invalidate(REGULAR_CUSTOMERS_CACHE_KEY)
@@ -1,3 +1,189 @@
-from django.test import TestCase
+import datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection, transaction, IntegrityError
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from caller import get_profiles, get_top_products
+from main_app import partitioning
+from main_app.inventory import available_stock, drifted_products, restock
+from main_app.models import Profile, Product, Order
+from main_app.order_processing import complete_order_batch
+
+
+OrderProduct = Order.products.through
+
+
+class ReportQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        profiles = Profile.objects.bulk_create(
+            Profile(
+                full_name=f"Customer {i:05d}",
+                email=f"customer{i}@example.com",
+                phone_number=f"0888{i:06d}",
+                address='Sofia',
+            )
+            for i in range(10_000)
+        )
+        cls.products = Product.objects.bulk_create(
+            Product(name=f"Product {i:02d}", description='Seeded', price=Decimal('9.99'), in_stock=100)
+            for i in range(50)
+        )
+        cls.orders = Order.objects.bulk_create(Order(profile=profile) for profile in profiles)
+
+    def count_queries(self, report, *args):
+        with CaptureQueriesContext(connection) as context:
+            report(*args)
+        return len(context.captured_queries)
+
+    def test_get_profiles_query_count_is_independent_of_matches(self):
+        self.assertEqual(self.count_queries(get_profiles, 'Customer 0000'), 1)
+        self.assertEqual(self.count_queries(get_profiles, 'Customer'), 1)
+
+    def test_get_top_products_query_count_is_independent_of_orders(self):
+        OrderProduct.objects.create(order=self.orders[0], product=self.products[0])
+        few = self.count_queries(get_top_products)
+
+        OrderProduct.objects.bulk_create(
+            OrderProduct(order=order, product=self.products[i % len(self.products)])
+            for i, order in enumerate(self.orders[1:])
+        )
+        many = self.count_queries(get_top_products)
+
+        self.assertEqual(few, 1)
+        self.assertEqual(many, few)
+
+
+class OrderTotalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        profile = Profile.objects.create(
+            full_name='John Doe', email='john@example.com', phone_number='0888123456', address='Sofia',
+        )
+        cls.laptop = Product.objects.create(name='Laptop', description='Seeded', price=Decimal('1499.99'), in_stock=10)
+        cls.headphones = Product.objects.create(
+            name='Headphones', description='Seeded', price=Decimal('199.99'), in_stock=30,
+        )
+        cls.order = Order.objects.create(profile=profile, discount_rate=Decimal('0.9'))
+        cls.order.products.add(cls.laptop, cls.headphones)
+
+    def test_deleting_a_product_takes_it_off_its_orders(self):
+        self.headphones.delete()
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.products_count, 1)
+        self.assertEqual(self.order.subtotal, Decimal('1499.99'))
+        self.assertEqual(self.order.total_price, Decimal('1349.99'))
+
+
+class OrderBatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        profile = Profile.objects.create(
+            full_name='John Doe', email='john@example.com', phone_number='0888123456', address='Sofia',
+        )
+        cls.common = Product.objects.create(name='Common', description='Seeded', price=Decimal('5.00'), in_stock=50)
+        cls.rare = Product.objects.create(name='Rare', description='Seeded', price=Decimal('5.00'), in_stock=1)
+
+        cls.orders = [Order.objects.create(profile=profile) for _ in range(4)]
+        for i, order in enumerate(cls.orders):
+            order.products.add(cls.common, *([cls.rare] if i in (1, 2) else []))
+
+    def test_batch_completes_in_order_and_parks_sold_out_orders(self):
+        batch = complete_order_batch(batch_size=10)
+
+        first, second, third, fourth = (order.pk for order in self.orders)
+        self.assertEqual(batch.completed, [first, second, fourth])
+        self.assertEqual(batch.parked, {third: [self.rare.pk]})
+        self.assertEqual(batch.deferred, [])
+        self.assertEqual(available_stock([self.common.pk, self.rare.pk]), {self.common.pk: 47, self.rare.pk: 0})
+        self.assertIsNone(complete_order_batch(batch_size=10))
+
+    def test_restock_wakes_parked_orders(self):
+        third = self.orders[2]
+        complete_order_batch(batch_size=10)
+
+        restock(self.rare, 1)
+
+        self.assertEqual(complete_order_batch(batch_size=10).completed, [third.pk])
+
+    def test_direct_stock_writes_reach_the_buckets(self):
+        complete_order_batch(batch_size=10)
+        call_command('compact_stock_ledger', stdout=StringIO())
+
+        self.rare.refresh_from_db()
+        self.rare.in_stock = 3
+        self.rare.save()
+        Product.objects.filter(pk=self.common.pk).update(in_stock=F('in_stock') + 10)
+
+        self.assertEqual(drifted_products(), [self.common.pk])
+        call_command('compact_stock_ledger', stdout=StringIO())
+
+        self.assertEqual(drifted_products(), [])
+        self.assertEqual(available_stock([self.common.pk, self.rare.pk]), {self.common.pk: 57, self.rare.pk: 3})
+        self.assertEqual(complete_order_batch(batch_size=10).completed, [self.orders[2].pk])
+
+
+@skipUnless(connection.vendor == 'postgresql', "Order partitioning needs PostgreSQL.")
+class OrderPartitioningMigrationTests(TransactionTestCase):
+    def setUp(self):
+        profile = Profile.objects.create(
+            full_name='Partitioned Customer', email='customer@example.com', phone_number='0888000000', address='Sofia',
+        )
+        self.product = Product.objects.create(name='Laptop', description='Seeded', price=Decimal('999.99'), in_stock=10)
+        self.order = Order.objects.create(profile=profile)
+        self.order.products.add(self.product)
+
+        self.addCleanup(call_command, 'migrate', 'main_app', verbosity=0)
+        self.addCleanup(call_command, 'migrate', 'main_app', '0008', verbosity=0)
+
+        call_command('migrate', 'main_app', '0008', verbosity=0)
+        with override_settings(PARTITION_ORDERS=True):
+            call_command('migrate', 'main_app', verbosity=0)
+
+    def test_orders_move_into_monthly_partitions(self):
+        self.assertTrue(partitioning.is_partitioned())
+        self.assertIn(partitioning.DEFAULT_PARTITION, partitioning.partitions())
+        self.assertIn(
+            partitioning.partition_name(partitioning.month_start(datetime.date.today())),
+            partitioning.monthly_partitions(),
+        )
+        self.assertEqual(list(Order.objects.get(pk=self.order.pk).products.all()), [self.product])
+
+    def test_time_bounded_query_prunes_partitions(self):
+        now = timezone.now()
+        plan = Order.objects.filter(creation_date__gte=now - datetime.timedelta(days=7), creation_date__lt=now).explain()
+        scanned = [name for name in partitioning.partitions() if name in plan]
+
+        self.assertLessEqual(len(scanned), 2, plan)
+        self.assertLess(len(scanned), len(partitioning.partitions()), plan)
+
+    def test_references_to_orders_are_still_enforced(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Order.products.through.objects.create(order_id=self.order.pk + 1000, product=self.product)
+
+        with self.assertRaises(IntegrityError), transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {partitioning.ORDER_TABLE} WHERE id = %s", [self.order.pk])
+
+        self.order.delete()
+        self.assertFalse(Order.products.through.objects.exists())
+
+    def test_migrating_back_restores_the_plain_table(self):
+        call_command('migrate', 'main_app', '0008', verbosity=0)
+
+        self.assertFalse(partitioning.is_partitioned())
+        with connection.cursor() as cursor:
+            referencing = {table for table, _, _ in partitioning.incoming_foreign_keys(cursor)}
+        self.assertEqual(
+            referencing,
+            {Order.products.through._meta.db_table, Order.stock_entries.field.model._meta.db_table},
+        )
+        self.assertEqual(list(Order.objects.get(pk=self.order.pk).products.all()), [self.product])
+        self.assertGreater(Order.objects.create(profile=self.order.profile).pk, self.order.pk)
@@ -6,9 +6,10 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
 django.setup()
 
 from main_app.models import Director, Actor, Movie
+from main_app.ratings import record_rating_changes, apply_all_rating_events
 import datetime
 from decimal import Decimal
-from django.db.models import Q, Avg, F, Case, When
+from django.db.models import Avg, Prefetch
 
 
 def populate_db():
@@ -72,28 +73,10 @@ def get_directors(search_name=None, search_nationality=None):
     if search_name is None and search_nationality is None:
         return ''
 
-    searched_directors = Director.objects.all()
-
-    if search_name is not None and search_nationality is not None:
-        searched_directors = Director.objects.filter(
-            full_name__icontains=search_name,
-            nationality__icontains=search_nationality,
-        )
-
-    elif search_name is not None:
-        searched_directors = Director.objects.filter(
-            full_name__icontains=search_name,
-        )
-
-    elif search_nationality is not None:
-        searched_directors = Director.objects.filter(
-            nationality__icontains=search_nationality,
-        )
-
-    if not searched_directors.exists():
-        return ''
-
-    searched_directors = searched_directors.order_by('full_name')
+    searched_directors = Director.objects.search(
+        full_name=search_name,
+        nationality=search_nationality,
+    ).order_by('full_name')
 
     return '\n'.join(
         f"Director: {d.full_name}, nationality: {d.nationality}, experience: {d.years_of_experience}"
@@ -101,32 +84,19 @@ def get_directors(search_name=None, search_nationality=None):
     )
 
 
-from django.db.models import Count
-
-
 def get_top_director():
-    top_director = (
-        Director.objects
-        .annotate(num_of_movies=Count('movies'))
-        .order_by('-num_of_movies', 'full_name')
-        .first()
-    )
+    top_director = Director.objects.get_directors_by_movies_count().first()
 
     if top_director is None:
         return ""
 
-    return f"Top Director: {top_director.full_name}, movies: {top_director.num_of_movies}."
+    return f"Top Director: {top_director.full_name}, movies: {top_director.movies_count}."
 
 
 def get_top_actor():
-    top_actor = (
-        Actor.objects
-        .annotate(num_of_movies=Count('starring_roles'))
-        .order_by('-num_of_movies', 'full_name')
-        .first()
-    )
+    top_actor = Actor.objects.get_actors_by_starring_count().first()
 
-    if top_actor is None or top_actor.num_of_movies == 0:
+    if top_actor is None:
         return ""
 
     movies = Movie.objects.filter(starring_actor=top_actor)
@@ -146,31 +116,33 @@ def get_top_actor():
 
 
 def get_actors_by_movies_count():
-    top_actors = Actor.objects.annotate(
-        num_of_movies=Count('movies_appeared_in')
-    ).order_by('-num_of_movies', 'full_name')[:3]
+    top_actors = Actor.objects.get_actors_by_appearances_count()[:3]
 
     if not top_actors:
         return ""
 
     return '\n'.join(
-        f"{a.full_name}, participated in {a.num_of_movies} movies"
+        f"{a.full_name}, participated in {a.appearances_count} movies"
         for a in top_actors
     )
 
 
 def get_top_rated_awarded_movie():
-    top_movie = Movie.objects.filter(
-        is_awarded=True,
-    ).order_by('-rating', 'title').first()
+    top_movie = (
+        Movie.objects
+        .filter(is_awarded=True)
+        .select_related('starring_actor')
+        .prefetch_related(Prefetch('actors', queryset=Actor.objects.order_by('full_name')))
+        .order_by('-rating', 'title')
+        .first()
+    )
 
     if not top_movie:
         return ""
 
     starring_actor_name = top_movie.starring_actor.full_name if top_movie.starring_actor else 'N/A'
 
-    cast = top_movie.actors.all().order_by('full_name')
-    cast_string = ', '.join(c.full_name for c in cast)
+    cast_string = ', '.join(c.full_name for c in top_movie.actors.all())
 
     return (
         f"Top rated awarded movie: {top_movie.title}, rating: {top_movie.rating:.1f}. "
@@ -180,14 +152,15 @@ def get_top_rated_awarded_movie():
 
 
 def increase_rating():
-    movies_to_update = Movie.objects.filter(
+    classic_movie_ids = Movie.objects.filter(
         is_classic=True,
         rating__lt=10.0
-    ).update(
-        rating=F('rating') + 0.1
-    )
+    ).values_list('id', flat=True)
+
+    events = record_rating_changes(classic_movie_ids, Decimal('0.1'))
+    apply_all_rating_events()
 
-    if movies_to_update == 0:
+    if not events:
         return "No ratings increased."
 
-    return f"Rating increased for {movies_to_update} movies."
+    return f"Rating increased for {len(events)} movies."
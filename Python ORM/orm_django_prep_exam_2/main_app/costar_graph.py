@@ -0,0 +1,285 @@
+import threading
+from array import array
+from collections import Counter, defaultdict
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from main_app.models import Movie, CoStarGraphVersion
+
+
+MAX_PATH_DEPTH = 6
+PATH_FRONTIER_CHUNK = 1000
+
+
+class CSR:
+    def __init__(self, rows):
+        self.keys = array('q', sorted(rows))
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+
+        for key in self.keys:
+            self.targets.extend(sorted(rows[key]))
+            self.offsets.append(len(self.targets))
+
+    def row(self, key):
+        i = self.index.get(key)
+        if i is None:
+            return ()
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def items(self):
+        for key in self.keys:
+            yield key, self.row(key)
+
+
+def trace_path(parents, target_id):
+    path = [target_id]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+    return path[::-1]
+
+
+def load_casts(movie_ids=None):
+    casts = defaultdict(set)
+    through = Movie.actors.through.objects.all()
+    starring = Movie.objects.filter(starring_actor__isnull=False)
+
+    if movie_ids is not None:
+        through = through.filter(movie_id__in=movie_ids)
+        starring = starring.filter(pk__in=movie_ids)
+
+    for movie_id, actor_id in through.values_list('movie_id', 'actor_id').iterator(chunk_size=10_000):
+        casts[movie_id].add(actor_id)
+    for movie_id, actor_id in starring.values_list('pk', 'starring_actor_id').iterator(chunk_size=10_000):
+        casts[movie_id].add(actor_id)
+
+    return casts
+
+
+class CoStarGraph:
+    COMPACT_THRESHOLD = 1024
+
+    def __init__(self, casts, version=0):
+        self.version = version
+        self._lock = threading.Lock()
+        self._dirty_movies = set()
+        self._compact(casts)
+
+    @classmethod
+    def load(cls, version=0):
+        return cls(load_casts(), version)
+
+    def _compact(self, casts):
+        filmographies = defaultdict(set)
+        for movie_id, cast in casts.items():
+            for actor_id in cast:
+                filmographies[actor_id].add(movie_id)
+
+        self._casts = CSR({movie_id: cast for movie_id, cast in casts.items() if cast})
+        self._filmographies = CSR(filmographies)
+        self._cast_overrides = {}
+        self._filmography_overrides = {}
+
+    def advance(self, version, movie_ids):
+        # Only the next version can be applied in place; a gap means another process changed casts too.
+        with self._lock:
+            if version != self.version + 1:
+                return False
+            self.version = version
+            self._dirty_movies.update(movie_ids)
+        return True
+
+    def refresh(self):
+        with self._lock:
+            dirty, self._dirty_movies = self._dirty_movies, set()
+        if not dirty:
+            return
+
+        fresh_casts = load_casts(dirty)
+        with self._lock:
+            for movie_id in dirty:
+                old_cast = set(self.cast(movie_id))
+                new_cast = fresh_casts.get(movie_id, set())
+                self._cast_overrides[movie_id] = frozenset(new_cast)
+
+                for actor_id in old_cast ^ new_cast:
+                    movies = set(self.movies_of(actor_id))
+                    if actor_id in new_cast:
+                        movies.add(movie_id)
+                    else:
+                        movies.discard(movie_id)
+                    self._filmography_overrides[actor_id] = frozenset(movies)
+
+            if len(self._cast_overrides) > self.COMPACT_THRESHOLD:
+                merged = {movie_id: set(cast) for movie_id, cast in self._casts.items()}
+                merged.update(self._cast_overrides)
+                self._compact(merged)
+
+    def cast(self, movie_id):
+        if movie_id in self._cast_overrides:
+            return self._cast_overrides[movie_id]
+        return self._casts.row(movie_id)
+
+    def movies_of(self, actor_id):
+        if actor_id in self._filmography_overrides:
+            return self._filmography_overrides[actor_id]
+        return self._filmographies.row(actor_id)
+
+    def collaborations(self, actor_id):
+        self.refresh()
+        shared = Counter()
+        for movie_id in self.movies_of(actor_id):
+            shared.update(self.cast(movie_id))
+        shared.pop(actor_id, None)
+        return shared
+
+    def co_stars(self, actor_id):
+        return set(self.collaborations(actor_id))
+
+    def top_collaborators(self, actor_id, limit=10):
+        shared = self.collaborations(actor_id)
+        return sorted(shared.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def shortest_path(self, source_id, target_id, max_depth=MAX_PATH_DEPTH):
+        self.refresh()
+        if source_id == target_id:
+            return [source_id]
+
+        parents = {source_id: None}
+        seen_movies = set()
+        frontier = [source_id]
+
+        for _ in range(max_depth):
+            next_frontier = []
+            for actor_id in frontier:
+                for movie_id in self.movies_of(actor_id):
+                    if movie_id in seen_movies:
+                        continue
+                    seen_movies.add(movie_id)
+
+                    for co_star_id in self.cast(movie_id):
+                        if co_star_id in parents:
+                            continue
+                        parents[co_star_id] = actor_id
+                        if co_star_id == target_id:
+                            return trace_path(parents, target_id)
+                        next_frontier.append(co_star_id)
+
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return None
+
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def graph_version():
+    return CoStarGraphVersion.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+
+
+def bump_graph_version():
+    CoStarGraphVersion.objects.get_or_create(pk=1)
+    CoStarGraphVersion.objects.filter(pk=1).update(version=F('version') + 1)
+    return graph_version()
+
+
+def get_graph():
+    global _graph
+    # Read before the casts, so a graph loaded now is at least as new as the version it records.
+    version = graph_version()
+    if _graph is None or _graph.version < version:
+        with _graph_lock:
+            if _graph is None or _graph.version < version:
+                _graph = CoStarGraph.load(version)
+    return _graph
+
+
+def mark_movies_changed(movie_ids):
+    movie_ids = list(movie_ids)
+    if movie_ids:
+        # Bumped in the writing transaction, so other processes see the new version with the new casts.
+        version = bump_graph_version()
+        # This process applies the change in place on commit, unless it missed another one in between.
+        transaction.on_commit(lambda: _graph is not None and _graph.advance(version, movie_ids))
+
+
+def reset_graph():
+    global _graph
+    _graph = None
+
+
+def cast_members_sql():
+    return (
+        f"SELECT movie_id, actor_id FROM {Movie.actors.through._meta.db_table}"
+        f" UNION"
+        f" SELECT id, starring_actor_id FROM {Movie._meta.db_table} WHERE starring_actor_id IS NOT NULL"
+    )
+
+
+def sql_top_collaborators(actor_id, limit=10):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH cast_members(movie_id, actor_id) AS ({cast_members_sql()})"
+            f" SELECT b.actor_id, COUNT(*) AS shared"
+            f" FROM cast_members a JOIN cast_members b ON b.movie_id = a.movie_id AND b.actor_id <> a.actor_id"
+            f" WHERE a.actor_id = %s"
+            f" GROUP BY b.actor_id"
+            f" ORDER BY shared DESC, b.actor_id"
+            f" LIMIT %s",
+            [actor_id, limit],
+        )
+        return cursor.fetchall()
+
+
+def sql_co_stars(actor_id):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH cast_members(movie_id, actor_id) AS ({cast_members_sql()})"
+            f" SELECT DISTINCT b.actor_id"
+            f" FROM cast_members a JOIN cast_members b ON b.movie_id = a.movie_id AND b.actor_id <> a.actor_id"
+            f" WHERE a.actor_id = %s",
+            [actor_id],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def sql_shortest_path(source_id, target_id, max_depth=MAX_PATH_DEPTH):
+    if source_id == target_id:
+        return [source_id]
+
+    # Breadth-first, one query per depth: an actor is expanded only from the depth it was first reached at.
+    parents = {source_id: None}
+    frontier = [source_id]
+
+    with connection.cursor() as cursor:
+        for _ in range(max_depth):
+            next_frontier = []
+            for start in range(0, len(frontier), PATH_FRONTIER_CHUNK):
+                chunk = frontier[start:start + PATH_FRONTIER_CHUNK]
+                cursor.execute(
+                    f"WITH cast_members(movie_id, actor_id) AS ({cast_members_sql()})"
+                    f" SELECT DISTINCT a.actor_id, b.actor_id"
+                    f" FROM cast_members a JOIN cast_members b ON b.movie_id = a.movie_id AND b.actor_id <> a.actor_id"
+                    f" WHERE a.actor_id IN ({', '.join(['%s'] * len(chunk))})"
+                    f" ORDER BY a.actor_id, b.actor_id",
+                    chunk,
+                )
+
+                for actor_id, co_star_id in cursor.fetchall():
+                    if co_star_id in parents:
+                        continue
+                    parents[co_star_id] = actor_id
+                    if co_star_id == target_id:
+                        return trace_path(parents, target_id)
+                    next_frontier.append(co_star_id)
+
+            if not next_frontier:
+                break
+            frontier = sorted(next_frontier)
+
+    return None
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from main_app.ratings import apply_all_rating_events
+
+
+class Command(BaseCommand):
+    help = 'Folds pending rating events into Movie.rating. Meant to run periodically.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        result = apply_all_rating_events(options['batch_size'])
+        rate = result.events / result.seconds if result.seconds else 0
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Applied {result.events} rating event/s to {result.movies} movie/s "
+            f"in {result.seconds:.3f} s ({rate:.0f} events/s)."
+        ))
@@ -0,0 +1,122 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main_app import costar_graph
+from main_app.models import Director, Actor, Movie
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a movie/actor graph and compares the in-memory CSR engine with the SQL fallback. '
+        'Runs in one transaction that is rolled back, so the seeded rows are never kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--actors', type=int, default=20_000)
+        parser.add_argument('--movies', type=int, default=50_000)
+        parser.add_argument('--cast-size', type=int, default=8)
+        parser.add_argument('--runs', type=int, default=50)
+        parser.add_argument('--max-depth', type=int, default=costar_graph.MAX_PATH_DEPTH)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.benchmark(options)
+            transaction.set_rollback(True)
+
+    def benchmark(self, options):
+        rng = random.Random(options['seed'])
+        actor_ids = self.seed_graph(rng, options)
+
+        start = time.perf_counter()
+        graph = costar_graph.CoStarGraph.load()
+        self.stdout.write(f"CSR build: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        samples = [tuple(rng.sample(actor_ids, 2)) for _ in range(options['runs'])]
+        max_depth = options['max_depth']
+
+        cases = (
+            ('co-stars', lambda a, b: graph.co_stars(a), lambda a, b: costar_graph.sql_co_stars(a)),
+            (
+                'top collaborators',
+                lambda a, b: graph.top_collaborators(a),
+                lambda a, b: costar_graph.sql_top_collaborators(a),
+            ),
+            (
+                'shortest path',
+                lambda a, b: graph.shortest_path(a, b, max_depth),
+                lambda a, b: costar_graph.sql_shortest_path(a, b, max_depth),
+            ),
+        )
+
+        for label, in_memory, sql in cases:
+            memory_ms, memory_results = self.measure(in_memory, samples)
+            sql_ms, sql_results = self.measure(sql, samples)
+
+            if label == 'shortest path':
+                mismatches = sum(
+                    (m is None) != (s is None) or (m is not None and len(m) != len(s))
+                    for m, s in zip(memory_results, sql_results)
+                )
+            else:
+                mismatches = sum(
+                    self.normalize(m) != self.normalize(s) for m, s in zip(memory_results, sql_results)
+                )
+
+            self.stdout.write(
+                f"{label}: csr p50 {statistics.median(memory_ms):.3f} ms, "
+                f"sql p50 {statistics.median(sql_ms):.3f} ms, mismatches {mismatches}"
+            )
+
+    @staticmethod
+    def measure(query, samples):
+        timings, results = [], []
+        for a, b in samples:
+            start = time.perf_counter()
+            results.append(query(a, b))
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings, results
+
+    @staticmethod
+    def normalize(result):
+        # Ties past the limit may be cut differently, so only compare the shared counts.
+        if isinstance(result, set):
+            return result
+        return [shared for _, shared in result]
+
+    def seed_graph(self, rng, options):
+        actors = Actor.objects.bulk_create(
+            (Actor(full_name=f"Benchmark actor {i}") for i in range(options['actors'])),
+            batch_size=5_000,
+        )
+        actor_ids = [actor.pk for actor in actors]
+        director = Director.objects.create(full_name='Benchmark Director')
+        through = Movie.actors.through
+
+        movies = Movie.objects.bulk_create(
+            (
+                Movie(
+                    title=f"Benchmark movie {i:07d}",
+                    release_date=datetime.date(2000, 1, 1),
+                    director=director,
+                    starring_actor_id=rng.choice(actor_ids),
+                )
+                for i in range(options['movies'])
+            ),
+            batch_size=5_000,
+        )
+        through.objects.bulk_create(
+            (
+                through(movie_id=movie.pk, actor_id=actor_id)
+                for movie in movies
+                for actor_id in rng.sample(actor_ids, options['cast_size'])
+            ),
+            batch_size=10_000,
+        )
+
+        return actor_ids
@@ -0,0 +1,79 @@
+import datetime
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from main_app.models import Director
+
+
+NATIONALITIES = ('North America', 'South America', 'Bulgaria', 'Germany', 'France', 'Japan', 'India', 'Nigeria')
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds directors and measures search latency for name, nationality and combined criteria. '
+        'Runs in one transaction that is rolled back, so the seeded rows are never kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directors', type=int, default=1_000_000)
+        parser.add_argument('--runs', type=int, default=200)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.benchmark(options)
+            transaction.set_rollback(True)
+
+    def benchmark(self, options):
+        rng = random.Random(options['seed'])
+        self.seed_directors(rng, options['directors'], options['batch_size'])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Director._meta.db_table}")
+
+        cases = (
+            ('name', lambda: {'full_name': self.random_word(rng, 4)}),
+            ('nationality', lambda: {'nationality': rng.choice(NATIONALITIES)[:5]}),
+            ('name+nationality', lambda: {
+                'full_name': self.random_word(rng, 3),
+                'nationality': rng.choice(NATIONALITIES)[:5],
+            }),
+        )
+
+        for label, make_criteria in cases:
+            timings = []
+            for _ in range(options['runs']):
+                criteria = make_criteria()
+                start = time.perf_counter()
+                list(Director.objects.search(**criteria).order_by('full_name')[:50])
+                timings.append((time.perf_counter() - start) * 1000)
+
+            percentiles = statistics.quantiles(timings, n=100)
+            self.stdout.write(f"{label}: p50 {percentiles[49]:.2f} ms, p99 {percentiles[98]:.2f} ms")
+
+    def seed_directors(self, rng, total, batch_size):
+        missing = total - Director.objects.count()
+
+        while missing > 0:
+            size = min(batch_size, missing)
+            Director.objects.bulk_create(
+                Director(
+                    full_name=f"{self.random_word(rng, rng.randint(4, 9)).capitalize()}"
+                              f" {self.random_word(rng, rng.randint(4, 12)).capitalize()}",
+                    birth_date=datetime.date(1940, 1, 1) + datetime.timedelta(days=rng.randrange(25_000)),
+                    nationality=rng.choice(NATIONALITIES),
+                    years_of_experience=rng.randrange(40),
+                )
+                for _ in range(size)
+            )
+            missing -= size
+
+    @staticmethod
+    def random_word(rng, length):
+        return ''.join(rng.choices(string.ascii_lowercase, k=length))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main_app.models import Director, Actor
+
+
+class Command(BaseCommand):
+    help = 'Recalculates the denormalized movie counters on Director and Actor.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            directors = Director.objects.recount_movies()
+            actors = Actor.objects.recount_movies()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Recounted movies for {directors} director/s and {actors} actor/s."
+        ))
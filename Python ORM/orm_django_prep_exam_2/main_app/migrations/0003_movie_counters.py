@@ -0,0 +1,51 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_director_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actor',
+            name='appearances_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='actor',
+            name='starring_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='director',
+            name='movies_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='actor',
+            index=models.Index(fields=['-starring_count', 'full_name'], name='actor_starring_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actor',
+            index=models.Index(fields=['-appearances_count', 'full_name'], name='actor_appearances_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='director',
+            index=models.Index(fields=['-movies_count', 'full_name'], name='director_movies_count_idx'),
+        ),
+        migrations.RunSQL(
+            sql=[
+                "UPDATE main_app_director SET movies_count = ("
+                " SELECT COUNT(*) FROM main_app_movie WHERE main_app_movie.director_id = main_app_director.id)",
+                "UPDATE main_app_actor SET starring_count = ("
+                " SELECT COUNT(*) FROM main_app_movie WHERE main_app_movie.starring_actor_id = main_app_actor.id)",
+                "UPDATE main_app_actor SET appearances_count = ("
+                " SELECT COUNT(*) FROM main_app_movie_actors WHERE main_app_movie_actors.actor_id = main_app_actor.id)",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_movie_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.DecimalField(decimal_places=1, max_digits=4)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('is_applied', models.BooleanField(default=False)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_events', to='main_app.movie')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('is_applied', False)), fields=['id'], name='rating_event_pending_idx')],
+            },
+        ),
+    ]
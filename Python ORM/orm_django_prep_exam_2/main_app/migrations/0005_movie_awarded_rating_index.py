@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_rating_events'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(condition=models.Q(('is_awarded', True)), fields=['-rating', 'title'], name='movie_awarded_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_movie_awarded_rating_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoStarGraphVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
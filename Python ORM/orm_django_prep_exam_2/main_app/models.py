@@ -1,6 +1,21 @@
+from django.core.exceptions import FieldError
 from django.db import models
 from django.core.validators import MinLengthValidator, MinValueValidator, MaxValueValidator
-from django.db.models import Count
+from django.db.models import Count, Q, Subquery, OuterRef, Value
+from django.db.models.functions import Coalesce
+
+
+def count_movies_subquery(**lookup):
+    return Coalesce(
+        Subquery(
+            Movie.objects.filter(**lookup)
+            .order_by()
+            .values(*lookup)
+            .annotate(total=Count('id'))
+            .values('total')
+        ),
+        Value(0),
+    )
 
 
 class PersonBase(models.Model):
@@ -15,11 +30,45 @@ class PersonBase(models.Model):
         abstract = True
 
 
-class DirectorManager(models.Manager):
+class DirectorQuerySet(models.QuerySet):
+    # Each of these has a trigram index on UPPER(column), the expression icontains compiles to.
+    SEARCHABLE_FIELDS = ('full_name', 'nationality')
+
+    def search(self, **criteria):
+        unknown = set(criteria) - set(self.SEARCHABLE_FIELDS)
+        if unknown:
+            raise FieldError(f"Cannot search directors by: {', '.join(sorted(unknown))}")
+
+        conditions = Q()
+        for field, value in criteria.items():
+            if value is not None:
+                conditions &= Q(**{f"{field}__icontains": value})
+
+        return self.filter(conditions)
+
+    def recount_movies(self):
+        return self.update(movies_count=count_movies_subquery(director=OuterRef('pk')))
+
+
+class DirectorManager(models.Manager.from_queryset(DirectorQuerySet)):
     def get_directors_by_movies_count(self):
-        return self.annotate(
-            movies_count=Count('movies')
-        ).order_by('-movies_count', 'full_name')
+        return self.order_by('-movies_count', 'full_name')
+
+
+class ActorQuerySet(models.QuerySet):
+    def recount_movies(self):
+        return self.update(
+            starring_count=count_movies_subquery(starring_actor=OuterRef('pk')),
+            appearances_count=count_movies_subquery(actors=OuterRef('pk')),
+        )
+
+
+class ActorManager(models.Manager.from_queryset(ActorQuerySet)):
+    def get_actors_by_starring_count(self):
+        return self.filter(starring_count__gt=0).order_by('-starring_count', 'full_name')
+
+    def get_actors_by_appearances_count(self):
+        return self.order_by('-appearances_count', 'full_name')
 
 
 class Director(PersonBase):
@@ -27,12 +76,27 @@ class Director(PersonBase):
         default=0,
         validators=[MinValueValidator(0)]
     )
+    movies_count = models.PositiveIntegerField(default=0)
     objects = DirectorManager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-movies_count', 'full_name'], name='director_movies_count_idx'),
+        ]
+
 
 class Actor(PersonBase):
     is_awarded = models.BooleanField(default=False)
     last_updated = models.DateTimeField(auto_now=True)
+    starring_count = models.PositiveIntegerField(default=0)
+    appearances_count = models.PositiveIntegerField(default=0)
+    objects = ActorManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-starring_count', 'full_name'], name='actor_starring_count_idx'),
+            models.Index(fields=['-appearances_count', 'full_name'], name='actor_appearances_count_idx'),
+        ]
 
 
 class Movie(models.Model):
@@ -84,3 +148,34 @@ class Movie(models.Model):
         Actor,
         related_name='movies_appeared_in'
     )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-rating', 'title'],
+                condition=models.Q(is_awarded=True),
+                name='movie_awarded_rating_idx',
+            ),
+        ]
+
+
+class RatingEvent(models.Model):
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='rating_events')
+    delta = models.DecimalField(max_digits=4, decimal_places=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    is_applied = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(is_applied=False), name='rating_event_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.delta:+} for {self.movie_id}"
+
+
+class CoStarGraphVersion(models.Model):
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Co-star graph version {self.version}"
@@ -0,0 +1,81 @@
+import time
+from collections import namedtuple
+from decimal import Decimal
+
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value, DecimalField
+from django.db.models.functions import Greatest, Least
+
+from main_app.models import Movie, RatingEvent
+
+
+RatingAggregation = namedtuple('RatingAggregation', 'events movies seconds')
+
+
+def rating_bounds():
+    validators = Movie._meta.get_field('rating').validators
+    lowest = next(v.limit_value for v in validators if isinstance(v, MinValueValidator))
+    highest = next(v.limit_value for v in validators if isinstance(v, MaxValueValidator))
+    return Decimal(str(lowest)), Decimal(str(highest))
+
+
+def record_rating_change(movie, delta):
+    return RatingEvent.objects.create(movie=movie, delta=delta)
+
+
+def record_rating_changes(movie_ids, delta, batch_size=10_000):
+    return RatingEvent.objects.bulk_create(
+        (RatingEvent(movie_id=movie_id, delta=delta) for movie_id in movie_ids),
+        batch_size=batch_size,
+    )
+
+
+def apply_rating_events(batch_size=10_000):
+    start = time.perf_counter()
+
+    with transaction.atomic():
+        event_ids = list(
+            RatingEvent.objects.filter(is_applied=False)
+            .order_by('id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+
+        if not event_ids:
+            return RatingAggregation(0, 0, time.perf_counter() - start)
+
+        events = RatingEvent.objects.filter(id__in=event_ids)
+        rating_field = DecimalField(max_digits=3, decimal_places=1)
+        change = Subquery(
+            events.filter(movie_id=OuterRef('id'))
+            .order_by()
+            .values('movie_id')
+            .annotate(total=Sum('delta'))
+            .values('total'),
+            output_field=rating_field,
+        )
+        lowest, highest = rating_bounds()
+
+        # The batch total is clamped once, so events within a batch may cancel out before hitting a bound.
+        movies = Movie.objects.filter(id__in=events.values('movie_id')).update(
+            rating=Greatest(
+                Least(F('rating') + change, Value(highest, output_field=rating_field)),
+                Value(lowest, output_field=rating_field),
+            )
+        )
+        events.update(is_applied=True)
+
+    return RatingAggregation(len(event_ids), movies, time.perf_counter() - start)
+
+
+def apply_all_rating_events(batch_size=10_000):
+    events = movies = 0
+    seconds = 0.0
+
+    while (batch := apply_rating_events(batch_size)).events:
+        events += batch.events
+        movies += batch.movies
+        seconds += batch.seconds
+
+    return RatingAggregation(events, movies, seconds)
@@ -0,0 +1,126 @@
+from django.db.models import F, Q
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from main_app import costar_graph
+from main_app.models import Director, Actor, Movie
+
+
+def shift_counter(model, pks, field, delta):
+    pks = [pk for pk in pks if pk is not None]
+    if pks and delta:
+        model.objects.filter(pk__in=pks).update(**{field: F(field) + delta})
+
+
+COUNTED_MOVIE_RELATIONS = (
+    ('director_id', Director, 'movies_count'),
+    ('starring_actor_id', Actor, 'starring_count'),
+)
+
+
+def load_deferred_relations(instance):
+    deferred = instance.get_deferred_fields().intersection(attname for attname, _, _ in COUNTED_MOVIE_RELATIONS)
+    if deferred:
+        instance.refresh_from_db(fields=deferred)
+
+
+@receiver(post_init, sender=Movie)
+def remember_movie_relations(sender, instance, **kwargs):
+    # Read __dict__ only: touching a deferred attribute would reload the row and fire post_init again.
+    instance._counted_relations = {
+        attname: instance.__dict__[attname]
+        for attname, _, _ in COUNTED_MOVIE_RELATIONS
+        if attname in instance.__dict__
+    }
+
+
+@receiver(pre_save, sender=Movie)
+def load_reassigned_movie_relations(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+
+    # A relation deferred at load time and assigned since has no remembered value yet.
+    unknown = [
+        attname
+        for attname, _, _ in COUNTED_MOVIE_RELATIONS
+        if attname in instance.__dict__ and attname not in instance._counted_relations
+    ]
+    if unknown:
+        instance._counted_relations.update(Movie.objects.filter(pk=instance.pk).values(*unknown).first() or {})
+
+
+@receiver(post_save, sender=Movie)
+def update_counters_on_movie_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    remembered = {} if created else instance._counted_relations
+
+    for attname, model, counter in COUNTED_MOVIE_RELATIONS:
+        # Still deferred means the save did not touch it.
+        if attname not in instance.__dict__:
+            continue
+
+        old_id, new_id = remembered.get(attname), instance.__dict__[attname]
+        if old_id != new_id:
+            shift_counter(model, [old_id], counter, -1)
+            shift_counter(model, [new_id], counter, 1)
+            if attname == 'starring_actor_id':
+                costar_graph.mark_movies_changed([instance.pk])
+
+    remember_movie_relations(sender, instance)
+
+
+@receiver(pre_delete, sender=Movie)
+def update_appearance_counters_on_movie_delete(sender, instance, **kwargs):
+    # The through rows go away with a fast delete that sends no m2m_changed.
+    Actor.objects.filter(movies_appeared_in=instance).update(appearances_count=F('appearances_count') - 1)
+    # post_delete runs after the row is gone, too late to load deferred relations.
+    load_deferred_relations(instance)
+
+
+@receiver(post_delete, sender=Movie)
+def update_counters_on_movie_delete(sender, instance, **kwargs):
+    for attname, model, counter in COUNTED_MOVIE_RELATIONS:
+        shift_counter(model, [getattr(instance, attname)], counter, -1)
+    costar_graph.mark_movies_changed([instance.pk])
+
+
+@receiver(m2m_changed, sender=Movie.actors.through)
+def update_appearance_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_add':
+        if reverse:
+            shift_counter(Actor, [instance.pk], 'appearances_count', len(pk_set))
+        else:
+            shift_counter(Actor, pk_set, 'appearances_count', 1)
+
+    elif action in ('pre_remove', 'pre_clear'):
+        # Only links that still exist are counted; remove() passes every requested pk.
+        if reverse:
+            movies = instance.movies_appeared_in.all()
+            if action == 'pre_remove':
+                movies = movies.filter(pk__in=pk_set)
+            shift_counter(Actor, [instance.pk], 'appearances_count', -movies.count())
+        else:
+            actors = Actor.objects.filter(movies_appeared_in=instance)
+            if action == 'pre_remove':
+                actors = actors.filter(pk__in=pk_set)
+            actors.update(appearances_count=F('appearances_count') - 1)
+
+
+@receiver(m2m_changed, sender=Movie.actors.through)
+def refresh_costar_graph(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        costar_graph.mark_movies_changed(list(instance.movies_appeared_in.values_list('pk', flat=True)))
+    elif action in ('post_add', 'post_remove'):
+        costar_graph.mark_movies_changed(pk_set if reverse else [instance.pk])
+    elif action == 'post_clear' and not reverse:
+        costar_graph.mark_movies_changed([instance.pk])
+
+
+@receiver(pre_delete, sender=Actor)
+def refresh_costar_graph_on_actor_delete(sender, instance, **kwargs):
+    # Cast links and starring roles are removed without per-movie signals.
+    costar_graph.mark_movies_changed(list(
+        Movie.objects.filter(Q(actors=instance) | Q(starring_actor=instance)).values_list('pk', flat=True).distinct()
+    ))
@@ -1,3 +1,95 @@
+import datetime
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from caller import get_top_rated_awarded_movie
+from main_app import costar_graph
+from main_app.models import Director, Actor, Movie
+
+
+class TopRatedAwardedMovieTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        director = Director.objects.create(full_name='Director One')
+        actors = Actor.objects.bulk_create(Actor(full_name=f"Actor {i}") for i in range(10))
+        movies = Movie.objects.bulk_create(
+            Movie(
+                title=f"Movie {i:05d}",
+                release_date=datetime.date(1950, 1, 1) + datetime.timedelta(days=i * 7),
+                rating=Decimal(i % 101) / 10,
+                is_awarded=i % 10 == 0,
+                director=director,
+                starring_actor=actors[i % len(actors)],
+            )
+            for i in range(500)
+        )
+        Movie.actors.through.objects.bulk_create(
+            Movie.actors.through(movie_id=movie.pk, actor_id=actors[(i + 1) % len(actors)].pk)
+            for i, movie in enumerate(movies)
+        )
+
+    def test_report_runs_two_queries(self):
+        with self.assertNumQueries(2):
+            report = get_top_rated_awarded_movie()
+
+        self.assertEqual(
+            report,
+            "Top rated awarded movie: Movie 00100, rating: 10.0. Starring actor: Actor 0. Cast: Actor 1",
+        )
+
+
+class MovieIndexTests(TestCase):
+    def index_sql(self, name):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT indexdef FROM pg_indexes WHERE indexname = %s", [name])
+            else:
+                cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = %s", [name])
+            return cursor.fetchone()[0]
+
+    def test_awarded_rating_index_definition(self):
+        with connection.cursor() as cursor:
+            index = connection.introspection.get_constraints(cursor, Movie._meta.db_table)['movie_awarded_rating_idx']
+
+        self.assertTrue(index['index'])
+        self.assertEqual(index['columns'], ['rating', 'title'])
+        self.assertEqual(index['orders'], ['DESC', 'ASC'])
+        self.assertRegex(self.index_sql('movie_awarded_rating_idx'), r'WHERE \(?"?is_awarded"?')
+
+
+class CoStarGraphTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        director = Director.objects.create(full_name='Director One')
+        cls.lead, cls.partner, cls.newcomer = Actor.objects.bulk_create(
+            Actor(full_name=name) for name in ('Lead', 'Partner', 'Newcomer')
+        )
+        cls.movie = Movie.objects.create(
+            title='Shared Movie', release_date=datetime.date(2000, 1, 1), director=director, starring_actor=cls.lead,
+        )
+        cls.movie.actors.add(cls.partner)
+
+    def setUp(self):
+        costar_graph.reset_graph()
+        self.addCleanup(costar_graph.reset_graph)
+
+    def test_change_committed_here_is_applied_in_place(self):
+        graph = costar_graph.get_graph()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.movie.actors.add(self.newcomer)
+
+        self.assertIs(costar_graph.get_graph(), graph)
+        self.assertEqual(graph.co_stars(self.lead.pk), {self.partner.pk, self.newcomer.pk})
+
+    def test_change_committed_elsewhere_reloads_the_graph(self):
+        graph = costar_graph.get_graph()
+
+        # Commit hooks do not run in a TestCase, so this process only learns of the change from the version.
+        self.movie.actors.add(self.newcomer)
+
+        fresh = costar_graph.get_graph()
+        self.assertIsNot(fresh, graph)
+        self.assertEqual(fresh.co_stars(self.lead.pk), {self.partner.pk, self.newcomer.pk})
@@ -1,12 +1,13 @@
 import os
 import django
-from django.db.models import Q, F, Min, Avg, Max
+from django.db.models import Q, F, Min, Avg
 
 # Set up Django
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
 django.setup()
 
 from main_app.models import *
+from main_app.quest_resolution import resolve_quest, QuestWithoutDragons
 
 
 def get_houses(search_string=None):
@@ -110,25 +111,16 @@ def get_earliest_quest():
 
 def announce_quest_winner(quest_code):
     try:
-        quest = Quest.objects.get(code=quest_code)
-    except Quest.DoesNotExist:
-        return "No such quest."
-
-    dragons = quest.dragons.all()
-    max_power = dragons.aggregate(max_power=Max('-power'))['max_power']
-    winner_dragon = dragons.filter(power=max_power).order_by('name').first()
-
-    winner_dragon.wins += 1
-    winner_dragon.save()
+        result = resolve_quest(quest_code)
+    except QuestWithoutDragons as exc:
+        return f"{exc}"
 
-    winner_dragon.house.wins += 1
-    winner_dragon.house.save()
-
-    quest.delete()
+    if result is None:
+        return "No such quest."
 
     return (
-        f"The quest: {quest.name} has been won by dragon {winner_dragon.name} from house {winner_dragon.house.name}."
-        f" The number of wins has been updated as follows: {winner_dragon.wins} total wins for the dragon"
-        f" and {winner_dragon.house.wins} total wins for the house."
-        f" The house was awarded with {quest.reward:.2f} coins."
+        f"The quest: {result.quest_name} has been won by dragon {result.dragon_name} from house {result.house_name}."
+        f" The number of wins has been updated as follows: {result.dragon_wins} total wins for the dragon"
+        f" and {result.house_wins} total wins for the house."
+        f" The house was awarded with {result.reward:.2f} coins."
     )
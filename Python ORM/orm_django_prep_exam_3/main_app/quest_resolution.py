@@ -0,0 +1,62 @@
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections, transaction
+from django.db.models import F
+
+from main_app.models import House, Dragon, Quest
+
+
+QuestResult = namedtuple('QuestResult', 'quest_name reward dragon_name dragon_wins house_name house_wins')
+
+
+class QuestWithoutDragons(Exception):
+    def __init__(self, quest_code):
+        self.quest_code = quest_code
+        super().__init__(f"Quest {quest_code} has no dragons to win it.")
+
+
+def resolve_quest(quest_code):
+    with transaction.atomic():
+        # A second resolver of the same quest waits here and then finds the row gone.
+        quest = Quest.objects.select_for_update().filter(code=quest_code).first()
+        if quest is None:
+            return None
+
+        winner = (
+            Dragon.objects.filter(quest=quest)
+            .order_by('-power', 'name')
+            .values('id', 'house_id')
+            .first()
+        )
+        if winner is None:
+            raise QuestWithoutDragons(quest_code)
+
+        # Dragon before house in every resolution, so concurrent winners never lock in opposite order.
+        Dragon.objects.filter(id=winner['id']).update(wins=F('wins') + 1)
+        House.objects.filter(id=winner['house_id']).update(wins=F('wins') + 1)
+
+        dragon_name, dragon_wins, house_name, house_wins = (
+            Dragon.objects.filter(id=winner['id'])
+            .values_list('name', 'wins', 'house__name', 'house__wins')
+            .get()
+        )
+
+        quest.delete()
+
+    return QuestResult(quest.name, quest.reward, dragon_name, dragon_wins, house_name, house_wins)
+
+
+def resolve_quests(quest_codes):
+    return sum(resolve_quest(code) is not None for code in quest_codes)
+
+
+def run_resolution_pool(quest_codes, workers, chunk_size=50):
+    quest_codes = list(quest_codes)
+    chunks = [quest_codes[i:i + chunk_size] for i in range(0, len(quest_codes), chunk_size)]
+
+    connections.close_all()
+
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as pool:
+        return sum(pool.map(resolve_quests, chunks))
@@ -1,3 +1,70 @@
-from django.test import TestCase
+import datetime
+import random
+import string
+from collections import Counter
+from decimal import Decimal
+from unittest import skipUnless
 
-# Create your tests here.
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from caller import announce_quest_winner
+from main_app.models import House, Dragon, Quest
+from main_app.quest_resolution import run_resolution_pool
+
+
+class QuestResolutionTests(TransactionTestCase):
+    def setUp(self):
+        rng = random.Random(42)
+        self.houses = House.objects.bulk_create(House(name=f"House {i}") for i in range(4))
+        self.dragons = Dragon.objects.bulk_create(
+            Dragon(name=f"Dragon {i:02d}", power=Decimal(rng.randint(10, 100)) / 10, house=rng.choice(self.houses))
+            for i in range(20)
+        )
+
+        start_time = timezone.now() + datetime.timedelta(days=1)
+        self.quests = Quest.objects.bulk_create(
+            Quest(
+                name=f"Quest {i:03d}",
+                code=''.join(string.ascii_letters[i // 52 ** k % 52] for k in range(4)),
+                start_time=start_time,
+                host=rng.choice(self.houses),
+            )
+            for i in range(200)
+        )
+
+        self.expected_wins = Counter()
+        for quest in self.quests:
+            contenders = rng.sample(self.dragons, rng.randint(1, 5))
+            quest.dragons.add(*contenders)
+            self.expected_wins[min(contenders, key=lambda dragon: (-dragon.power, dragon.name)).id] += 1
+
+    def test_quest_without_dragons_is_announced_and_kept(self):
+        quest = self.quests[0]
+        quest.dragons.clear()
+
+        self.assertEqual(announce_quest_winner(quest.code), f"Quest {quest.code} has no dragons to win it.")
+        self.assertTrue(Quest.objects.filter(pk=quest.pk).exists())
+
+    @skipUnless(connection.vendor == 'postgresql', "Concurrent resolution needs PostgreSQL row locking.")
+    def test_concurrent_resolution_awards_each_quest_once(self):
+        submissions = [quest.code for quest in self.quests] * 3
+        random.Random(7).shuffle(submissions)
+
+        resolved = run_resolution_pool(submissions, workers=4, chunk_size=25)
+
+        expected_house_wins = Counter()
+        for dragon in self.dragons:
+            expected_house_wins[dragon.house_id] += self.expected_wins[dragon.id]
+
+        self.assertEqual(resolved, len(self.quests))
+        self.assertFalse(Quest.objects.exists())
+        self.assertEqual(
+            dict(Dragon.objects.values_list('id', 'wins')),
+            {dragon.id: self.expected_wins[dragon.id] for dragon in self.dragons},
+        )
+        self.assertEqual(
+            dict(House.objects.values_list('id', 'wins')),
+            {house.id: expected_house_wins[house.id] for house in self.houses},
+        )